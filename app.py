@@ -1,69 +1,200 @@
 import dash
-from dash import dcc, html
+from dash import dcc, html, DiskcacheManager
 import dash_bootstrap_components as dbc
+import diskcache
+import plotly.io as pio
 from dotenv import load_dotenv
+from flask import request
+import hashlib
 import os
+from typing import NamedTuple
+
+# Load environment variables before importing the components, which read
+# their environment values at import
+load_dotenv()
 
 # Import components
-from components.navbar import create_navbar
+from components.card import create_script_card
 
 # Import all callbacks (this will register them automatically)
 from callbacks import register_all_callbacks
 
-# Load environment variables
-load_dotenv()
+# Dash serializes the layout and every callback response through plotly's
+# JSON encoder; use the orjson engine rather than falling back to json
+pio.json.config.default_engine = "orjson"
+
+# Environment values used by the dashboard, read once at startup
+API_BASE_URL = os.getenv('API_BASE_URL', 'https://api.hchb.com/fhir/r4')
+ENV = os.getenv('ENV', 'Production')
+OUTPUT_DIRECTORY = os.getenv('OUTPUT_DIRECTORY', 'output')
+
+# Icon and font stylesheets are not needed for first paint, so they are
+# preloaded from the page template instead of blocking render. Point these at
+# copies under assets/ (e.g. /assets/vendor/fontawesome/all.min.css) to serve
+# them locally and skip the CDN connections entirely.
+FONT_AWESOME_CSS = os.getenv('FONT_AWESOME_CSS', 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css')
+GOOGLE_FONTS_CSS = os.getenv('GOOGLE_FONTS_CSS', 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Roboto+Mono&display=swap')
+
+def _preconnect_links(*urls):
+    """
+    Build preconnect hints for the external origins among the given URLs.
+    
+    Args:
+        urls: Stylesheet URLs; local paths are skipped
+        
+    Returns:
+        String of <link rel="preconnect"> tags
+    """
+    origins = []
+    for url in urls:
+        if url.startswith("http"):
+            origins.append("/".join(url.split("/", 3)[:3]))
+    # Google Fonts serves the font files themselves from a second origin
+    if any("fonts.googleapis.com" in origin for origin in origins):
+        origins.append("https://fonts.gstatic.com")
+    
+    return "\n        ".join(
+        f'<link rel="preconnect" href="{origin}" crossorigin>' for origin in dict.fromkeys(origins)
+    )
+
+# Script runs take minutes, so they run as background callbacks in a separate
+# process instead of holding a web worker for the whole run
+background_callback_manager = DiskcacheManager(diskcache.Cache(os.path.join(OUTPUT_DIRECTORY, ".cache")))
 
 # Initialize the Dash app with Bootstrap theme and custom CSS
 app = dash.Dash(
     __name__, 
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css',
-        'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Roboto+Mono&display=swap'
-    ],
+    external_stylesheets=[dbc.themes.BOOTSTRAP],
     assets_folder="assets",
-    suppress_callback_exceptions=True
+    suppress_callback_exceptions=False,
+    eager_loading=False,
+    update_title=None,
+    compress=True,
+    background_callback_manager=background_callback_manager
 )
 
+# Layout, dependency and callback payloads are repetitive JSON that compresses well
+app.server.config["COMPRESS_MIMETYPES"] = [
+    "application/json", "text/html", "text/css", "application/javascript"
+]
+app.server.config["COMPRESS_LEVEL"] = 6
+
+@app.server.after_request
+def _cache_layout(response):
+    """
+    Let browsers revalidate the static layout instead of re-downloading it.
+    
+    Registered after Flask-Compress, so it runs first and hashes the
+    uncompressed body.
+    
+    Args:
+        response: The outgoing Flask response
+        
+    Returns:
+        The response, with ETag/Cache-Control set for /_dash-layout
+    """
+    if request.path.endswith("/_dash-layout") and response.status_code == 200:
+        response.set_etag(hashlib.md5(response.get_data()).hexdigest())
+        response.headers["Cache-Control"] = "public, max-age=60"
+        response.make_conditional(request)
+    return response
+
+# The navbar and footer never change and have no callbacks, so they are
+# rendered as plain HTML in the page template instead of being sent in the
+# layout JSON
+STATIC_NAVBAR_HTML = """<nav class="mb-4 py-2 shadow navbar navbar-expand-md navbar-dark bg-primary sticky-top">
+            <div class="container-fluid">
+                <a href="/" class="d-flex align-items-center" style="text-decoration: none;">
+                    <img src="/assets/logo.png" height="36px" class="me-3 d-inline-block align-middle">
+                    <span class="ms-2 d-inline-block align-middle navbar-brand">FHIR Data Automation</span>
+                </a>
+                <ul class="ms-auto flex-row align-items-center navbar-nav">
+                    <li class="nav-item"><a href="#" class="nav-link active">Dashboard</a></li>
+                </ul>
+            </div>
+        </nav>"""
+
+STATIC_FOOTER_HTML = """<div class="container-fluid px-5 pb-5">
+            <footer>
+                <hr class="mb-5">
+                <p class="text-center text-muted mb-1">FHIR Data Automation Dashboard © 2025</p>
+                <p class="text-center text-muted small">Powered by <a href="#" class="text-decoration-none">HCHB FHIR API</a></p>
+            </footer>
+        </div>"""
+
 app.title = "HCHB FHIR Integration"
+app.index_string = f"""<!DOCTYPE html>
+<html>
+    <head>
+        {{%metas%}}
+        <title>{{%title%}}</title>
+        {{%favicon%}}
+        {_preconnect_links(FONT_AWESOME_CSS, GOOGLE_FONTS_CSS)}
+        <link rel="preload" as="style" href="{FONT_AWESOME_CSS}" onload="this.onload=null;this.rel='stylesheet'">
+        <link rel="preload" as="style" href="{GOOGLE_FONTS_CSS}" onload="this.onload=null;this.rel='stylesheet'">
+        <noscript>
+            <link rel="stylesheet" href="{FONT_AWESOME_CSS}">
+            <link rel="stylesheet" href="{GOOGLE_FONTS_CSS}">
+        </noscript>
+        {{%css%}}
+    </head>
+    <body>
+        {STATIC_NAVBAR_HTML}
+        {{%app_entry%}}
+        {STATIC_FOOTER_HTML}
+        <footer>
+            {{%config%}}
+            {{%scripts%}}
+            {{%renderer%}}
+        </footer>
+    </body>
+</html>"""
 server = app.server  # For deployment
 
+class ScriptConfig(NamedTuple):
+    """Immutable script card configuration"""
+    title: str
+    description: str
+    script_id: str
+    script_path: str
+    api_details: tuple
+
 # Define script cards configuration for easier maintenance
-script_configs = [
-    {
-        "title": "Alert Media Integration",
-        "description": "Run the Alert Media batch process to sync healthcare alerts with the notification system.",
-        "script_id": "alert-media",
-        "script_path": "scripts.alert_media_batch",
-        "api_details": [
+SCRIPT_CONFIGS = (
+    ScriptConfig(
+        title="Alert Media Integration",
+        description="Run the Alert Media batch process to sync healthcare alerts with the notification system.",
+        script_id="alert-media",
+        script_path="scripts.alert_media_batch",
+        api_details=(
             "This script extracts alert data from the HCHB FHIR API and prepares notifications for the Alert Media system.",
             "It processes critical patient alerts that require immediate attention from healthcare providers.",
             "API Endpoints Used:",
             "• Patient API - To retrieve patient demographic information",
             "• Care Team API - To identify assigned healthcare providers",
             "• Condition API - To identify critical patient conditions",
-        ]
-    },
-    {
-        "title": "Coordination Notes",
-        "description": "Run the Coordination Notes extraction process to retrieve all care coordination notes.",
-        "script_id": "coordination-notes",
-        "script_path": "scripts.coordination_notes_csv",
-        "api_details": [
+        )
+    ),
+    ScriptConfig(
+        title="Coordination Notes",
+        description="Run the Coordination Notes extraction process to retrieve all care coordination notes.",
+        script_id="coordination-notes",
+        script_path="scripts.coordination_notes_csv",
+        api_details=(
             "This script retrieves coordination notes from the HCHB FHIR API, which contain important information about care coordination activities.",
             "It processes interdisciplinary team communications and patient care planning notes.",
             "API Endpoints Used:",
             "• Document Reference - Coordination Note API - For retrieving care coordination documentation",
             "• Episode of Care API - To link notes to specific care episodes",
             "• Practitioner API - To identify note authors and recipients",
-        ]
-    },
-    {
-        "title": "Patient Demographics",
-        "description": "Run the Patients data extraction process to retrieve comprehensive patient information.",
-        "script_id": "patients",
-        "script_path": "scripts.patients_csv",
-        "api_details": [
+        )
+    ),
+    ScriptConfig(
+        title="Patient Demographics",
+        description="Run the Patients data extraction process to retrieve comprehensive patient information.",
+        script_id="patients",
+        script_path="scripts.patients_csv",
+        api_details=(
             "This script extracts comprehensive patient demographic and clinical information from the HCHB FHIR API.",
             "It includes personal details, contact information, diagnoses, and care episodes.",
             "API Endpoints Used:",
@@ -72,14 +203,14 @@ script_configs = [
             "• Episode of Care API - To retrieve patient care episodes",
             "• Related Person - Episode Contact API - To retrieve patient emergency contacts",
             "• Living Arrangement API - To retrieve patient living situation",
-        ]
-    },
-    {
-        "title": "Weekly Appointments",
-        "description": "Run the Weekly Appointments extraction process to retrieve scheduled patient visits.",
-        "script_id": "weekly-appointments",
-        "script_path": "scripts.weekly_appointments_csv",
-        "api_details": [
+        )
+    ),
+    ScriptConfig(
+        title="Weekly Appointments",
+        description="Run the Weekly Appointments extraction process to retrieve scheduled patient visits.",
+        script_id="weekly-appointments",
+        script_path="scripts.weekly_appointments_csv",
+        api_details=(
             "This script extracts weekly appointment data from the HCHB FHIR API.",
             "It includes scheduled visits, visit types, assigned caregivers, and visit details.",
             "API Endpoints Used:",
@@ -88,14 +219,14 @@ script_configs = [
             "• Care Team API - To identify assigned healthcare providers",
             "• Service Location API - To retrieve visit locations",
             "• Worker API - To retrieve caregiver information",
-        ]
-    },
-    {
-        "title": "Workers Directory",
-        "description": "Run the Workers data extraction process to retrieve information about all healthcare workers.",
-        "script_id": "workers",
-        "script_path": "scripts.workers_csv",
-        "api_details": [
+        )
+    ),
+    ScriptConfig(
+        title="Workers Directory",
+        description="Run the Workers data extraction process to retrieve information about all healthcare workers.",
+        script_id="workers",
+        script_path="scripts.workers_csv",
+        api_details=(
             "This script extracts worker data from the HCHB FHIR API.",
             "It includes healthcare professionals, their roles, qualifications, and assignments.",
             "API Endpoints Used:",
@@ -103,197 +234,120 @@ script_configs = [
             "• Worker Location API - To retrieve worker service areas",
             "• Organization - Team API - To retrieve team assignments",
             "• Organization - Branch API - To retrieve branch assignments",
-        ]
-    }
-]
+        )
+    ),
+)
+
+# Shared classNames for dashboard headings
+_CARD_TITLE_CLS = "card-title d-flex align-items-center"
+_SECTION_TITLE_CLS = "mb-5 mt-4 d-flex align-items-center"
+
+def _card_header(icon, text):
+    """
+    Create a card header with a Font Awesome icon and title.
+    
+    Args:
+        icon: Font Awesome icon name (e.g. "fa-tasks")
+        text: Header title
+        
+    Returns:
+        dash component: A dbc.CardHeader component
+    """
+    return dbc.CardHeader([
+        html.H4([html.I(className=f"fas {icon} me-3"), text], className=_CARD_TITLE_CLS),
+    ])
 
-def create_script_card(title, description, script_id, script_path, api_details=None):
+def _section_title(icon, text):
     """
-    Create a script card for running automation scripts.
+    Create a dashboard section heading with a Font Awesome icon.
     
     Args:
-        title: Title of the script card
-        description: Description of the script
-        script_id: Unique ID for the script
-        script_path: Path to the script module
-        api_details: List of API details for the modal
+        icon: Font Awesome icon name (e.g. "fa-chart-line")
+        text: Section title
         
     Returns:
-        dash component: A dbc.Card component
+        dash component: A html.H2 component
     """
-    # Define icon based on script ID
-    icons = {
-        "alert-media": "fas fa-bell",
-        "coordination-notes": "fas fa-clipboard",
-        "patients": "fas fa-user",
-        "weekly-appointments": "fas fa-calendar-alt",
-        "workers": "fas fa-users"
-    }
+    return html.H2([html.I(className=f"fas {icon} me-3"), text], className=_SECTION_TITLE_CLS)
+
+# Script cards built once at import, keyed by script ID
+SCRIPT_CARDS = {
+    config.script_id: create_script_card(config.title, config.description, config.script_id)
+    for config in SCRIPT_CONFIGS
+}
+
+# Module path of the script run by each script card
+SCRIPT_PATHS = {config.script_id: config.script_path for config in SCRIPT_CONFIGS}
+
+# API details for each script ID, used to build a modal's body on first open
+API_DETAILS_BY_SCRIPT = {config.script_id: config.api_details for config in SCRIPT_CONFIGS}
+
+# Readable name of each script, recorded in the process tracking store
+SCRIPT_NAMES = {config.script_id: config.title for config in SCRIPT_CONFIGS}
+
+# (base, max) records shown by the data processed counter, by the first
+# keyword found in the current process name
+PROCESS_SCALES = {
+    "Patient": (1000, 5000),
+    "Appointment": (200, 1000)
+}
+DEFAULT_SCALE = (50, 500)
+
+def _build_script_card_rows():
+    """
+    Build the two rows of script cards in a single pass over SCRIPT_CONFIGS.
     
-    icon_class = icons.get(script_id, "fas fa-cogs")
+    Returns:
+        Tuple of two dbc.Row components
+    """
+    first_row, second_row = [], []
+    for i, config in enumerate(SCRIPT_CONFIGS):
+        card = SCRIPT_CARDS[config.script_id]
+        if i < 3:
+            first_row.append(dbc.Col([card], md=6, xl=4, className="mb-5"))
+        else:
+            second_row.append(dbc.Col([card], md=6, className="mb-5"))
     
-    # Create the script card
-    return dbc.Card([
-        dbc.CardHeader([
-            html.H4([
-                html.I(className=f"{icon_class} me-2"),
-                title
-            ], className="card-title d-flex align-items-center"),
-        ]),
-        dbc.CardBody([
-            # Card Content
-            html.P(description, className="card-text mb-4"),
+    return dbc.Row(first_row, className="mb-3"), dbc.Row(second_row, className="mb-5")
+
+def build_layout():
+    """
+    Build the dashboard layout.
+    
+    Returns:
+        dash component: The root html.Div of the dashboard
+    """
+    return html.Div([
+        # Animated bar across the top of the page while any script is running
+        html.Div(id="animated-progress-bar", className="animated-progress-bar", style={"display": "none"}),
+    
+        # Main container
+        dbc.Container([
+            # Active Processes Section (at the top)
             dbc.Row([
                 dbc.Col([
-                    dbc.Button([
-                        html.I(className="fas fa-play me-2"),
-                        "Run Script"
-                    ], 
-                    id={"type": "run-script", "index": script_id}, 
-                    color="primary", 
-                    className="me-2"),
-                ], width="auto"),
-                dbc.Col([
-                    dbc.Button([
-                        html.I(className="fas fa-info-circle me-2"),
-                        "API Details"
-                    ], id={"type": "open-modal", "index": script_id}, color="secondary"),
-                ], width="auto"),
-            ], className="mb-4"),
-            
-            # Status indicator (initially hidden) - Fixed ID format to match callback expectations
-            html.Div(
-                id={"type": "script-status-indicator", "index": script_id},
-                className="mb-3",
-                style={"display": "none"}
-            ),
-            
-            # Log container
-            html.Div([
-                html.Hr(className="my-3"),
-                html.H5([
-                    html.I(className="fas fa-terminal me-2"),
-                    "Execution Log:"
-                ], className="mb-3 d-flex align-items-center"),
-                
-                # Output area
-                html.Div(
-                    id={"type": "script-output", "index": script_id}, 
-                    className="log-output",
-                    style={"maxHeight": "250px", "overflowY": "auto"}
-                )
-            ], id={"type": "log-container", "index": script_id}, className="log-container", style={"display": "none"}),
-        ]),
-        
-        # Modal for API Details
-        dbc.Modal([
-            dbc.ModalHeader(dbc.ModalTitle([
-                html.I(className=f"{icon_class} me-2"),
-                f"{title} - API Details"
-            ])),
-            dbc.ModalBody([
-                html.Div([
-                    html.P(api_details[0], className="lead mb-4") if api_details and len(api_details) > 0 else None,
-                    *[
-                        html.P(detail, className="mb-3") 
-                        if not detail.startswith("•") else 
-                        html.Div([
-                            html.I(className="fas fa-check-circle me-2 text-primary"),
-                            detail[1:].strip()
-                        ], className="mb-2 d-flex align-items-center")
-                        for detail in (api_details[1:] if api_details and len(api_details) > 1 else [])
-                    ]
-                ])
+                    dbc.Card([
+                        _card_header("fa-tasks", "Active Processes"),
+                        dbc.CardBody([
+                            html.Div(id="active-processes-list", children=[
+                                html.P("No active processes", className="text-muted")
+                            ], className="p-3")
+                        ])
+                    ], className="shadow h-100")
+                ], width=12, className="mb-5"),
             ]),
-            dbc.ModalFooter(
-                dbc.Button([
-                    html.I(className="fas fa-times me-2"),
-                    "Close"
-                ], id={"type": "close-modal", "index": script_id}, className="ms-auto")
-            ),
-        ], id={"type": "modal", "index": script_id}, is_open=False, size="lg", scrollable=True),
-    ], 
-    className="h-100 shadow", 
-    id={"type": "script-card", "index": script_id})
-
-# Dashboard layout
-app.layout = html.Div([
-    # Navigation bar at the top
-    dbc.Navbar(
-        dbc.Container([
-            # Brand/logo with improved styling
-            html.A(
-                [
-                    html.Img(src="/assets/logo.png", height="36px", className="me-3 d-inline-block align-middle"),
-                    dbc.NavbarBrand("FHIR Data Automation", className="ms-2 d-inline-block align-middle"),
-                ],
-                href="/",
-                style={"textDecoration": "none"},
-                className="d-flex align-items-center"
-            ),
-            # Toggle button for mobile view
-            dbc.NavbarToggler(id="navbar-toggler", n_clicks=0),
-            # Simplified navigation - only showing Dashboard
-            dbc.Collapse(
-                dbc.Nav(
-                    [
-                        dbc.NavItem(dbc.NavLink("Dashboard", href="#", active=True)),
-                    ],
-                    navbar=True,
-                    className="ms-auto align-items-center"
-                ),
-                id="navbar-collapse",
-                navbar=True,
-                is_open=False,
-            ),
-        ], fluid=True),
-        color="primary",
-        dark=True,
-        className="mb-4 py-2 shadow",
-        sticky="top",
-    ),
-    
-    # Main container
-    dbc.Container([
-        # Active Processes Section (at the top)
-        dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.H4([
-                            html.I(className="fas fa-tasks me-3"),
-                            "Active Processes"
-                        ], className="card-title d-flex align-items-center"),
-                    ]),
-                    dbc.CardBody([
-                        html.Div(id="active-processes-list", children=[
-                            html.P("No active processes", className="text-muted")
-                        ], className="p-3")
-                    ])
-                ], className="shadow h-100")
-            ], width=12, className="mb-5"),
-        ]),
         
-        # System Status Cards - Two column design
-        dbc.Row([
-            dbc.Col([
-                html.H2([
-                    html.I(className="fas fa-chart-line me-3"),
-                    "System Status"
-                ], className="mb-5 mt-4 d-flex align-items-center"),
-            ], width=12),
+            # System Status Cards - Two column design
+            dbc.Row([
+                dbc.Col([
+                    _section_title("fa-chart-line", "System Status"),
+                ], width=12),
             
-            # Left Status Column - API Status with simple spinner
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.H4([
-                            html.I(className="fas fa-server me-3"),
-                            "API Connection"
-                        ], className="card-title d-flex align-items-center"),
-                    ]),
-                    dbc.CardBody([
-                        html.Div([
+                # Left Status Column - API Status with simple spinner
+                dbc.Col([
+                    dbc.Card([
+                        _card_header("fa-server", "API Connection"),
+                        dbc.CardBody([
                             html.Div([
                                 html.Span("API Status: ", className="fw-bold me-2"),
                                 html.Span([
@@ -302,37 +356,41 @@ app.layout = html.Div([
                                            style={"display": "none"}),
                                     html.I(id="api-status-icon", className="fas fa-check-circle text-success me-2"),
                                     html.Span(id="api-status-text", children="Connected")
-                                ], className="d-inline-flex align-items-center")
-                            ], className="mb-4"),
+                                ], className="d-inline-flex align-items-center"),
+                                # Shown while any script is calling the API
+                                html.Div(
+                                    id="api-active-indicator",
+                                    className="status-badge status-badge-running ms-2",
+                                    style={"display": "none"},
+                                    children=[
+                                        html.Div(className="processing-spinner"),
+                                        html.Span("API operations active")
+                                    ]
+                                )
+                            ], className="mb-4 d-flex align-items-center"),
                             html.Div([
                                 html.Span("API URL: ", className="fw-bold me-2"),
-                                html.Code(os.getenv('API_BASE_URL', 'https://api.hchb.com/fhir/r4'),
+                                html.Code(API_BASE_URL,
                                          className="bg-light rounded px-2 py-1")
                             ], className="mb-4"),
                             html.Div([
                                 html.Span("Last Refresh: ", className="fw-bold me-2"),
-                                html.Div(id="last-refresh", className="d-inline")
+                                html.I(className="fas fa-sync-alt me-2 text-info"),
+                                html.Span(id="last-refresh", className="text-info")
                             ], className="mb-4"),
                             html.Div([
                                 html.Span("Environment: ", className="fw-bold me-2"),
-                                html.Span(os.getenv('ENV', 'Production'), className="text-primary")
+                                html.Span(ENV, className="text-primary")
                             ], className="mb-2")
-                        ], className="p-2")
-                    ], className="p-4")
-                ], className="shadow h-100")
-            ], md=6, className="mb-5"),
+                        ], className="status-card-body")
+                    ], className="shadow h-100")
+                ], md=6, className="mb-5"),
             
-            # Right Status Column - Simple progress display
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader([
-                        html.H4([
-                            html.I(className="fas fa-tachometer-alt me-3"),
-                            "Processing Status"
-                        ], className="card-title d-flex align-items-center"),
-                    ]),
-                    dbc.CardBody([
-                        html.Div([
+                # Right Status Column - Simple progress display
+                dbc.Col([
+                    dbc.Card([
+                        _card_header("fa-tachometer-alt", "Processing Status"),
+                        dbc.CardBody([
                             html.Div([
                                 html.Span("Current Process: ", className="fw-bold me-2"),
                                 html.Span(id="current-process", className="text-primary fw-bold")
@@ -354,66 +412,53 @@ app.layout = html.Div([
                                 html.Div(id="data-processed", children="0 records", 
                                        className="text-primary")
                             ], className="mb-2")
-                        ], className="p-2")
-                    ], className="p-4")
-                ], className="shadow h-100")
-            ], md=6, className="mb-5"),
-        ]),
-        
-        # Main content - Script cards
-        dbc.Row([
-            dbc.Col([
-                html.H2([
-                    html.I(className="fas fa-tasks me-3"),
-                    "Automation Tools"
-                ], className="mb-5 mt-4 d-flex align-items-center"),
-            ], width=12),
-        ]),
-        
-        # First row of script cards (dynamically generated from config)
-        dbc.Row([
-            dbc.Col([
-                create_script_card(**config)
-            ], md=6, xl=4, className="mb-5")
-            for config in script_configs[:3]  # First 3 cards in first row
-        ], className="mb-3"),
-        
-        # Second row of script cards (dynamically generated from config)
-        dbc.Row([
-            dbc.Col([
-                create_script_card(**config)
-            ], md=6, className="mb-5")
-            for config in script_configs[3:]  # Remaining cards in second row
-        ], className="mb-5"),
+                        ], className="status-card-body")
+                    ], className="shadow h-100")
+                ], md=6, className="mb-5"),
+            ]),
         
-        # Footer
-        html.Footer([
-            html.Hr(className="my-5"),
+            # Main content - Script cards
             dbc.Row([
                 dbc.Col([
-                    html.P([
-                        "FHIR Data Automation Dashboard © 2025"
-                    ], className="text-center text-muted mb-1"),
-                    html.P([
-                        "Powered by ",
-                        html.A("HCHB FHIR API", href="#", className="text-decoration-none")
-                    ], className="text-center text-muted small")
-                ])
-            ])
-        ], className="mt-5"),
-    ], fluid=True, className="p-5"),
+                    _section_title("fa-tasks", "Automation Tools"),
+                ], width=12),
+            ]),
+        
+            # Script cards (dynamically generated from config): first 3 cards in
+            # the first row, remaining cards in the second row
+            *_build_script_card_rows(),
+        ], fluid=True, className="p-5"),
     
-    # Store for tracking active processes
-    dcc.Store(id="process-status"),
+        # Store for tracking active processes
+        dcc.Store(id="process-status"),
     
-    # Interval for updating status
-    dcc.Interval(id="status-interval", interval=1000, n_intervals=0),
-])
+        # Readable script names for the process tracking store
+        dcc.Store(id="script-names", data=SCRIPT_NAMES),
+    
+        # Store for the raw progress of the current process, formatted in the browser
+        dcc.Store(id="current-progress"),
+    
+        # Record scales for the data processed counter
+        dcc.Store(id="process-scales", data={"scales": PROCESS_SCALES, "default": DEFAULT_SCALE}),
+    
+        # Store for the active processes, rendered as cards in the browser
+        dcc.Store(id="active-processes-data"),
+    
+        # Interval for updating status; enabled only while a script is running
+        dcc.Interval(id="status-interval", interval=1000, n_intervals=0, disabled=True),
+    ])
+
+# Dashboard layout; it is static, so it is built once at import
+app.layout = build_layout()
 
 # Register all callbacks
-register_all_callbacks(app)
+register_all_callbacks(app, SCRIPT_PATHS, API_DETAILS_BY_SCRIPT)
 
-# Print message when starting the app
+# Development server only; production runs under Gunicorn (see gunicorn.conf.py).
+# Debug mode (reloader and debugger) is opt-in via DASH_DEBUG=1.
 if __name__ == "__main__":
+    debug = os.getenv("DASH_DEBUG", "0") == "1"
     print("Starting FHIR Data Automation dashboard at http://127.0.0.1:8050")
-    app.run_server(debug=True)
\ No newline at end of file
+    if not debug:
+        print("For production, run: gunicorn -c gunicorn.conf.py app:server")
+    app.run_server(debug=debug)
\ No newline at end of file
@@ -2,24 +2,31 @@
 Callbacks package initialization.
 Import and register all callbacks for the Healing Hands Data Automation dashboard.
 """
+from callbacks.modal_callbacks import register_modal_callbacks
+from callbacks.script_callbacks import register_script_callbacks
+from callbacks.status_callbacks import register_status_callbacks
+from callbacks.loading_callbacks import register_loading_callbacks
 
-def register_all_callbacks(app):
+def register_all_callbacks(app, script_paths, api_details_by_script):
     """
     Register all callbacks with the app.
     
+    Registration is idempotent so re-importing the app module (e.g. under a
+    reloader) never registers the same callbacks twice.
+    
     Args:
         app: The Dash app instance
+        script_paths: Dict mapping script ID to its script module path
+        api_details_by_script: Dict mapping script ID to its API details tuple
     """
-    # Import all callback modules
-    from callbacks.modal_callbacks import register_modal_callbacks
-    from callbacks.script_callbacks import register_script_callbacks
-    from callbacks.status_callbacks import register_status_callbacks
-    from callbacks.loading_callbacks import register_loading_callbacks
+    if getattr(app, "_callbacks_registered", False):
+        return
     
     # Register each set of callbacks
-    register_modal_callbacks(app)
-    register_script_callbacks(app)
+    register_modal_callbacks(app, api_details_by_script)
+    register_script_callbacks(app, script_paths)
     register_status_callbacks(app)
     register_loading_callbacks(app)
+    app._callbacks_registered = True
     
     print("All callbacks registered successfully")
\ No newline at end of file
@@ -2,8 +2,23 @@
 Loading indicator callbacks for the Healing Hands Data Automation dashboard.
 """
 import dash
-from dash import callback, Input, Output, State, ALL, MATCH, ctx
-import random
+from dash import callback, Input, Output, State, MATCH, html
+
+# Status badge contents shown when a script finishes
+_SUCCESS_BADGE = [
+    html.Div(className="success-icon me-2"),
+    html.Span("Completed")
+]
+_ERROR_BADGE = [
+    html.Div(className="error-icon me-2"),
+    html.Span("Failed")
+]
+
+# Status badge (className, contents) for each script status code
+_COMPLETION_BADGES = {
+    "ok": ("status-badge status-badge-success pulse-animation", _SUCCESS_BADGE),
+    "err": ("status-badge status-badge-error pulse-animation", _ERROR_BADGE)
+}
 
 def register_loading_callbacks(app):
     """
@@ -12,63 +27,57 @@ def register_loading_callbacks(app):
     Args:
         app: The Dash app instance
     """
-    # Callback to show/hide top animated progress bar based on any script running
-    @app.callback(
-        Output("animated-progress-bar", "style"),
-        [Input({"type": "loading-overlay", "index": ALL}, "style")],
+    # Show the top animated progress bar and the API operations active indicator
+    # while any script is running. Driven by the single process-status store
+    # rather than every card's overlay style, and run in the browser.
+    app.clientside_callback(
+        """
+        function(process_status) {
+            var running = Object.values(process_status || {}).some(function(process) {
+                return process.status === "running";
+            });
+            if (running) {
+                return [
+                    {"display": "block"},
+                    {"display": "flex"},
+                    "status-badge status-badge-running status-badge-shimmer pulse-animation"
+                ];
+            }
+            return [{"display": "none"}, {"display": "none"}, "status-badge status-badge-running"];
+        }
+        """,
+        [Output("animated-progress-bar", "style"),
+         Output("api-active-indicator", "style"),
+         Output("api-active-indicator", "className")],
+        Input("process-status", "data"),
         prevent_initial_call=True
     )
-    def toggle_animated_progress_bar(loading_styles):
-        """
-        Show animated progress bar when any script is running.
-        
-        Args:
-            loading_styles: List of style dictionaries for all loading overlays
-            
-        Returns:
-            Style dictionary for the animated progress bar
-        """
-        # Check if any loading overlay is visible
-        any_loading = any(
-            style.get("display") == "flex" 
-            for style in loading_styles 
-            if style is not None
-        )
-        
-        if any_loading:
-            return {"display": "block"}
-        else:
-            return {"display": "none"}
     
-    # Callback to show/hide loading indicators when script is running
-    @app.callback(
+    # Show loading indicators and the log container when a script is run. The
+    # outputs are fixed values, so this runs in the browser; together with the
+    # clientside activity indicators above, a run click no longer needs any
+    # server round-trip besides the script run itself.
+    app.clientside_callback(
+        """
+        function(n_clicks) {
+            if (!n_clicks) {
+                return Array(4).fill(window.dash_clientside.no_update);
+            }
+            return [
+                {"display": "flex"},
+                {"display": "inline-flex"},
+                "status-badge status-badge-running status-badge-shimmer",
+                {"display": "block"}
+            ];
+        }
+        """,
         [Output({"type": "loading-overlay", "index": MATCH}, "style"),
          Output({"type": "status-badge", "index": MATCH}, "style"),
-         Output({"type": "status-badge", "index": MATCH}, "className")],
+         Output({"type": "status-badge", "index": MATCH}, "className"),
+         Output({"type": "log-container", "index": MATCH}, "style")],
         Input({"type": "run-script", "index": MATCH}, "n_clicks"),
-        [State({"type": "run-script", "index": MATCH}, "id")],
         prevent_initial_call=True
     )
-    def toggle_loading_indicators(n_clicks, button_id):
-        """
-        Show loading indicators when a script is run and hide them when complete.
-        
-        Args:
-            n_clicks: Number of clicks on the run button
-            button_id: ID of the button that was clicked
-            
-        Returns:
-            Tuple of (overlay_style, badge_style, badge_class)
-        """
-        if not ctx.triggered:
-            return dash.no_update, dash.no_update, dash.no_update
-        
-        # Show loading indicators when button is clicked
-        if n_clicks:
-            # Show loading overlay and badge
-            return {"display": "flex"}, {"display": "inline-flex"}, "status-badge status-badge-running status-badge-shimmer"
-        
-        return dash.no_update, dash.no_update, dash.no_update
     
     # Callback to hide loading indicators when script execution completes
     @app.callback(
@@ -76,44 +85,32 @@ def register_loading_callbacks(app):
          Output({"type": "status-badge", "index": MATCH}, "style", allow_duplicate=True),
          Output({"type": "status-badge", "index": MATCH}, "className", allow_duplicate=True),
          Output({"type": "status-badge", "index": MATCH}, "children")],
-        Input({"type": "script-status", "index": MATCH}, "children"),
+        Input({"type": "script-status-code", "index": MATCH}, "data"),
         [State({"type": "run-script", "index": MATCH}, "id")],
         prevent_initial_call=True
     )
-    def update_indicators_on_completion(status_text, button_id):
+    def update_indicators_on_completion(status_code, button_id):
         """
         Update loading indicators when script execution completes.
         
         Args:
-            status_text: Status text from script execution
+            status_code: Result of the script run, "ok" or "err"
             button_id: ID of the run button
             
         Returns:
             Tuple of (overlay_style, badge_style, badge_class, badge_text)
         """
-        if not status_text:
+        if not status_code:
             return dash.no_update, dash.no_update, dash.no_update, dash.no_update
         
         # Hide loading overlay
         overlay_style = {"display": "none"}
         
         # Update badge to show completion status
-        if "successfully" in str(status_text):
-            # Success badge
+        badge = _COMPLETION_BADGES.get(status_code)
+        if badge:
             badge_style = {"display": "inline-flex"}
-            badge_class = "status-badge status-badge-success pulse-animation"
-            badge_text = [
-                html.Div(className="success-icon me-2"),
-                html.Span("Completed")
-            ]
-        elif "Error" in str(status_text) or "failed" in str(status_text):
-            # Error badge
-            badge_style = {"display": "inline-flex"}
-            badge_class = "status-badge status-badge-error pulse-animation"
-            badge_text = [
-                html.Div(className="error-icon me-2"),
-                html.Span("Failed")
-            ]
+            badge_class, badge_text = badge
         else:
             # Hide badge if status is ambiguous
             badge_style = {"display": "none"}
@@ -122,75 +119,32 @@ def register_loading_callbacks(app):
         
         return overlay_style, badge_style, badge_class, badge_text
     
-    # Callback to show the API operations active indicator when any script is running
-    @app.callback(
-        [Output("api-active-indicator", "style"),
-         Output("api-active-indicator", "className")],
-        [Input({"type": "loading-overlay", "index": ALL}, "style")],
-        prevent_initial_call=True
-    )
-    def update_api_activity_indicator(loading_styles):
+    # Data processed counter is a cosmetic estimate derived from the progress
+    # percentage, so it is computed in the browser instead of costing a server
+    # round-trip on every progress update. The scale is picked from the name of
+    # the current process using the process-scales store.
+    app.clientside_callback(
         """
-        Show the API operations active indicator when any script is running.
-        
-        Args:
-            loading_styles: List of style dictionaries for all loading overlays
+        function(progress_value, progress, process_scales) {
+            if (!progress_value) {
+                return "0 records";
+            }
             
-        Returns:
-            Tuple of (style_dict, class_name)
-        """
-        # Check if any loading overlay is visible
-        any_loading = any(
-            style.get("display") == "flex" 
-            for style in loading_styles 
-            if style is not None
-        )
-        
-        if any_loading:
-            return {"display": "flex"}, "status-badge status-badge-running status-badge-shimmer pulse-animation"
-        else:
-            return {"display": "none"}, "status-badge status-badge-running"
+            var scales = process_scales.scales;
+            var name = (progress && progress.process_name) || "";
+            var key = Object.keys(scales).find(function(k) { return name.indexOf(k) !== -1; });
+            var scale = key ? scales[key] : process_scales.default;
+            var base = scale[0], max_records = scale[1];
             
-    # Callback to update the data processed counter
-    @app.callback(
+            // Add slight randomness for realistic feel
+            var records = Math.min(max_records, base + (progress_value / 100) * (max_records - base));
+            records = Math.floor(Math.floor(records) * (0.95 + Math.random() * 0.1));
+            return records.toLocaleString("en-US") + " records";
+        }
+        """,
         Output("data-processed", "children"),
         Input("progress-bar", "value"),
-        State("current-process", "children"),
+        [State("current-progress", "data"),
+         State("process-scales", "data")],
         prevent_initial_call=True
-    )
-    def update_data_processed(progress_value, process_name):
-        """
-        Update the data processed counter based on progress.
-        
-        Args:
-            progress_value: Current progress percentage
-            process_name: Name of the current process
-            
-        Returns:
-            Data processed text
-        """
-        if not progress_value or progress_value == 0:
-            return "0 records"
-        
-        # Calculate a reasonable number based on progress
-        if isinstance(process_name, str) and "Patient" in process_name:
-            # Patient data - higher numbers
-            base = 1000
-            max_records = 5000
-        elif isinstance(process_name, str) and "Appointment" in process_name:
-            # Appointments - medium numbers
-            base = 200
-            max_records = 1000
-        else:
-            # Default - lower numbers
-            base = 50
-            max_records = 500
-        
-        # Calculate records based on progress with some randomness
-        records = int(min(max_records, base + (progress_value / 100) * (max_records - base)))
-        # Add slight randomness for realistic feel
-        records = int(records * random.uniform(0.95, 1.05))
-        
-        # Format with comma for thousands
-        formatted_records = f"{records:,}"
-        return f"{formatted_records} records"
\ No newline at end of file
+    )
\ No newline at end of file
@@ -2,42 +2,61 @@
 Modal dialog callbacks for the Healing Hands Data Automation dashboard.
 """
 import dash
-from dash import callback, Input, Output, State, ALL, MATCH
+from dash import callback, Input, Output, State, ALL, MATCH, ctx
 
-def register_modal_callbacks(app):
+from components.card import get_api_details_body
+
+def register_modal_callbacks(app, api_details_by_script):
     """
     Register all modal-related callbacks with the app.
     
     Args:
         app: The Dash app instance
+        api_details_by_script: Dict mapping script ID to its API details tuple
     """
-    @app.callback(
+    # Opening and closing a modal is pure UI state, so it runs in the browser
+    app.clientside_callback(
+        """
+        function(open_clicks, close_clicks, is_open) {
+            var triggered = window.dash_clientside.callback_context.triggered;
+            if (!triggered.length) {
+                return window.dash_clientside.no_update;
+            }
+            
+            var prop_id = triggered[0].prop_id;
+            if (prop_id.indexOf('"open-modal"') > -1) {
+                return true;
+            } else if (prop_id.indexOf('"close-modal"') > -1) {
+                return false;
+            }
+            return is_open;
+        }
+        """,
         Output({"type": "modal", "index": MATCH}, "is_open"),
         [Input({"type": "open-modal", "index": MATCH}, "n_clicks"),
          Input({"type": "close-modal", "index": MATCH}, "n_clicks")],
         [State({"type": "modal", "index": MATCH}, "is_open")],
         prevent_initial_call=True
     )
-    def toggle_modal(open_clicks, close_clicks, is_open):
+    
+    @app.callback(
+        Output({"type": "modal-body", "index": MATCH}, "children"),
+        Input({"type": "open-modal", "index": MATCH}, "n_clicks"),
+        State({"type": "modal-body", "index": MATCH}, "children"),
+        prevent_initial_call=True
+    )
+    def load_modal_body(open_clicks, current_body):
         """
-        Toggle the visibility of a modal dialog.
+        Build a modal's API details the first time it is opened.
         
         Args:
             open_clicks: Number of clicks on the open button
-            close_clicks: Number of clicks on the close button
-            is_open: Current state of the modal
+            current_body: Current modal body children
             
         Returns:
-            New state for the modal
+            The API details body, or no_update if already loaded
         """
-        ctx = dash.callback_context
-        if not ctx.triggered:
+        if current_body:
             return dash.no_update
-            
-        prop_id = ctx.triggered[0]["prop_id"].split(".")[0]
-        if "open-modal" in prop_id:
-            return True
-        elif "close-modal" in prop_id:
-            return False
-            
-        return is_open
\ No newline at end of file
+        
+        return get_api_details_body(api_details_by_script.get(ctx.triggered_id["index"]))
\ No newline at end of file
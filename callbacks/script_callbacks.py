@@ -2,44 +2,30 @@
 Script execution callbacks for the Healing Hands Data Automation dashboard.
 """
 import dash
-from dash import callback, Input, Output, State, ALL, MATCH, ctx
-from utils.script_runner import run_script_with_output
+from dash import callback, Input, Output, State, ALL, MATCH
 
-def register_script_callbacks(app):
+def register_script_callbacks(app, script_paths):
     """
     Register script execution callbacks with the app.
     
     Args:
         app: The Dash app instance
+        script_paths: Dict mapping script ID to its script module path
     """
-    # Callback to show/hide log container when script is run
-    @app.callback(
-        Output({"type": "log-container", "index": MATCH}, "style"),
-        Input({"type": "run-script", "index": MATCH}, "n_clicks"),
-        prevent_initial_call=True
-    )
-    def toggle_log_container(n_clicks):
-        """
-        Show log container when script is run.
-        
-        Args:
-            n_clicks: Number of clicks on the run button
-            
-        Returns:
-            Style dict for the log container
-        """
-        if n_clicks:
-            return {"display": "block"}
-        return dash.no_update
-    
-    # Callback for script execution and results with loading states
+    # Callback for script execution and results with loading states. Runs in
+    # the background callback manager so the web worker is free while the
+    # script runs. The run button is disabled from the process-status store
+    # below, since background callbacks cannot take pattern-matching running=
+    # outputs.
     @app.callback(
         [Output({"type": "script-output", "index": MATCH}, "children"),
          Output({"type": "script-status", "index": MATCH}, "children"),
          Output({"type": "script-status", "index": MATCH}, "style"),
-         Output({"type": "script-status", "index": MATCH}, "className")],
+         Output({"type": "script-status", "index": MATCH}, "className"),
+         Output({"type": "script-status-code", "index": MATCH}, "data")],
         Input({"type": "run-script", "index": MATCH}, "n_clicks"),
         State({"type": "run-script", "index": MATCH}, "id"),
+        background=True,
         prevent_initial_call=True
     )
     def run_script_callback(n_clicks, button_id):
@@ -51,28 +37,22 @@ def register_script_callbacks(app):
             button_id: ID of the button that was clicked
             
         Returns:
-            Tuple of (output_text, status_text, status_style, status_class)
+            Tuple of (output_text, status_text, status_style, status_class, status_code)
+            where status_code is "ok" or "err"
         """
         if not n_clicks:
-            return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
         
         # Get script ID from button
         script_id = button_id["index"]
         
-        # Get script information based on script_id
-        script_paths = {
-            "alert-media": "scripts.alert_media_batch",
-            "coordination-notes": "scripts.coordination_notes_csv",
-            "patients": "scripts.patients_csv",
-            "weekly-appointments": "scripts.weekly_appointments_csv",
-            "workers": "scripts.workers_csv"
-        }
-        
         script_path = script_paths.get(script_id)
         if not script_path:
-            return "Invalid script path", "Error: Invalid script path", {"display": "block"}, "alert alert-danger"
+            return "Invalid script path", "Error: Invalid script path", {"display": "block"}, "alert alert-danger", "err"
         
-        # Run the script
+        # Run the script (the runner, and the scripts it imports, are only
+        # loaded once a script is actually run)
+        from utils.script_runner import run_script_with_output
         status, output = run_script_with_output(script_path)
         
         # Set status information based on result
@@ -80,62 +60,84 @@ def register_script_callbacks(app):
             status_text = "✅ Script executed successfully!"
             status_style = {"display": "block"}
             status_class = "alert alert-success"
+            status_code = "ok"
         else:
             status_text = "❌ Script execution failed. See log for details."
             status_style = {"display": "block"}
             status_class = "alert alert-danger"
+            status_code = "err"
         
-        return output, status_text, status_style, status_class
+        return output, status_text, status_style, status_class, status_code
     
-    # Map of script IDs to their readable names
-    script_names = {
-        "alert-media": "Alert Media Integration",
-        "coordination-notes": "Coordination Notes",
-        "patients": "Patient Demographics",
-        "weekly-appointments": "Weekly Appointments",
-        "workers": "Workers Directory"
-    }
-    
-    # Add callback to update process tracking store when script runs
-    @app.callback(
-        Output("process-status", "data"),
-        [Input({"type": "run-script", "index": ALL}, "n_clicks")],
-        [State({"type": "run-script", "index": ALL}, "id"),
-         State("process-status", "data")],
-        prevent_initial_call=True
-    )
-    def update_process_status(n_clicks_list, button_ids, current_status):
+    # Update the process tracking store when a script starts or finishes. This
+    # only bookkeeps which card was triggered, so it runs in the browser, and
+    # the store is left untouched when nothing actually changed. Readable
+    # script names come from the script-names store.
+    app.clientside_callback(
         """
-        Update the process status store when a script runs.
-        
-        Args:
-            n_clicks_list: List of click counts for all run buttons
-            button_ids: List of button IDs
-            current_status: Current process status data
+        function(n_clicks_list, status_list, current_status, script_names) {
+            var triggered = window.dash_clientside.callback_context.triggered;
+            if (!triggered || !triggered.length || !triggered[0].value) {
+                return window.dash_clientside.no_update;
+            }
             
-        Returns:
-            Updated process status data
-        """
-        if not ctx.triggered:
-            return dash.no_update
+            var prop_id = triggered[0].prop_id;
+            var triggered_id;
+            try {
+                triggered_id = JSON.parse(prop_id.slice(0, prop_id.lastIndexOf(".")));
+            } catch (e) {
+                return window.dash_clientside.no_update;
+            }
             
-        # Get the triggered input
-        triggered_id = ctx.triggered_id
-        if not triggered_id or "index" not in triggered_id:
-            return dash.no_update
+            var script_id = triggered_id.index;
+            var updated = Object.assign({}, current_status || {});
             
-        # Get the script ID
-        script_id = triggered_id["index"]
-        script_name = script_names.get(script_id, script_id)
-        
-        # Update process status
-        if current_status is None:
-            current_status = {}
+            // A status update means the script has finished running
+            if (triggered_id.type === "script-status") {
+                var process = updated[script_id];
+                if (!process || process.status === "completed") {
+                    return window.dash_clientside.no_update;
+                }
+                updated[script_id] = Object.assign({}, process, {status: "completed"});
+                return updated;
+            }
             
-        current_status[script_id] = {
-            "name": script_name,
-            "status": "running",
-            "start_time": dash.no_update  # Use actual timestamp in status_callbacks.py
+            var now = new Date();
+            updated[script_id] = {
+                name: (script_names || {})[script_id] || script_id,
+                status: "running",
+                start_time: new Date(now.getTime() - now.getTimezoneOffset() * 60000).toISOString().slice(0, -1)
+            };
+            return updated;
         }
-        
-        return current_status
\ No newline at end of file
+        """,
+        Output("process-status", "data"),
+        [Input({"type": "run-script", "index": ALL}, "n_clicks"),
+         Input({"type": "script-status", "index": ALL}, "children")],
+        [State("process-status", "data"),
+         State("script-names", "data")],
+        prevent_initial_call=True
+    )
+    
+    # Poll status every second while a script is running, and stop polling
+    # entirely when the dashboard is idle. Each card's run button is disabled
+    # while its script is running.
+    app.clientside_callback(
+        """
+        function(process_status, button_ids) {
+            var status = process_status || {};
+            var running = Object.values(status).some(function(process) {
+                return process.status === "running";
+            });
+            var buttons_disabled = button_ids.map(function(button_id) {
+                var process = status[button_id.index];
+                return Boolean(process && process.status === "running");
+            });
+            return [!running, buttons_disabled];
+        }
+        """,
+        [Output("status-interval", "disabled"),
+         Output({"type": "run-script", "index": ALL}, "disabled")],
+        Input("process-status", "data"),
+        State({"type": "run-script", "index": ALL}, "id"),
+    )
\ No newline at end of file
@@ -2,12 +2,16 @@
 Status update callbacks for the Healing Hands Data Automation dashboard.
 """
 import dash
-from dash import callback, Input, Output, html
-import time
+from dash import callback, Input, Output, State, Patch
 from datetime import datetime
-import os
-import json
-from utils.progress_tracker import get_current_progress
+import functools
+from utils.progress_tracker import get_progress_snapshot, parse_timestamp
+
+# Progress fields read by the clientside progress formatter
+_PROGRESS_DISPLAY_FIELDS = (
+    "process_name", "status", "message", "percentage",
+    "processed_items", "total_items", "duration", "error"
+)
 
 def register_status_callbacks(app):
     """
@@ -16,201 +20,263 @@ def register_status_callbacks(app):
     Args:
         app: The Dash app instance
     """
-    # Callback for Last Refresh in Status Card
-    @app.callback(
+    # Last Refresh timestamp is pure formatting, so it runs in the browser
+    # instead of costing a server round-trip on every interval tick
+    app.clientside_callback(
+        """
+        function(n_intervals) {
+            var now = new Date();
+            var pad = function(value) { return String(value).padStart(2, "0"); };
+            return "Last Updated: " + now.getFullYear() + "-" + pad(now.getMonth() + 1) + "-" +
+                pad(now.getDate()) + " " + pad(now.getHours()) + ":" + pad(now.getMinutes()) + ":" +
+                pad(now.getSeconds());
+        }
+        """,
         Output("last-refresh", "children"),
         Input("status-interval", "n_intervals"),
     )
-    def update_last_refresh(n_intervals):
-        """
-        Update the last refresh timestamp.
-        
-        Args:
-            n_intervals: Number of interval refreshes
-            
-        Returns:
-            HTML component with refresh timestamp
-        """
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        return html.P([
-            html.I(className="fas fa-sync-alt me-2"),
-            f"Last Updated: {timestamp}"
-        ], className="text-info")
 
-    # Callback for updating progress information
+    # Single callback for everything refreshed on the status interval, so each
+    # tick costs one round-trip instead of one per section. The layout already
+    # carries the idle state, so nothing needs to be sent on page load. The
+    # interval is disabled while idle, so a process starting or finishing also
+    # triggers a refresh to pick up its final state.
     @app.callback(
-        [Output("current-process", "children"),
-         Output("progress-bar", "value"),
-         Output("progress-bar", "label"),
-         Output("progress-bar", "color"),
-         Output("progress-text", "children")],
-        Input("status-interval", "n_intervals"),
+        [Output("current-progress", "data"),
+         Output("active-processes-data", "data")],
+        [Input("status-interval", "n_intervals"),
+         Input("process-status", "data")],
+        [State("current-progress", "data"),
+         State("active-processes-data", "data")],
+        prevent_initial_call=True
     )
-    def update_progress(n_intervals):
+    def update_status(n_intervals, process_status, previous_progress, previous_processes):
         """
-        Update the progress indicators based on current progress.
+        Update the current progress and active processes stores.
         
         Args:
             n_intervals: Number of interval refreshes
+            process_status: Process tracking store data
+            previous_progress: Progress data currently held in the store
+            previous_processes: Active process data currently held in the store
             
         Returns:
-            Tuple of (process_name, progress_value, progress_label, progress_color, progress_text)
+            Tuple of (current_progress, active_processes)
         """
-        # Get current progress
-        progress = get_current_progress()
-        
-        if not progress:
-            return [
-                html.Span([
-                    html.I(className="fas fa-hourglass me-2"),
-                    "No Active Process"
-                ]), 
-                0, 
-                "", 
-                "primary",
-                "No active process running"
-            ]
-        
-        # Format process name
-        process_name = progress["process_name"]
-        
-        # Calculate percentage
-        percentage = progress["percentage"]
+        # One scan of the progress directory serves both sections
+        current_progress, processes = get_progress_snapshot()
+        active_processes = [_process_card_data(process) for process in _select_active_processes(processes)]
         
-        # Determine progress bar color based on status
-        if progress["status"] == "completed":
-            color = "success"
-            icon = "fas fa-check-circle"
-        elif progress["status"] == "error":
-            color = "danger"
-            icon = "fas fa-exclamation-circle"
-        else:
-            color = "primary"
-            icon = "fas fa-sync fa-spin"
-        
-        # Format progress text
-        if progress["status"] == "running":
-            progress_text = f"{progress['message']} - {progress['processed_items']} of {progress['total_items']} items ({percentage}% complete)"
-        elif progress["status"] == "completed":
-            progress_text = f"{progress['message']} in {progress['duration']}"
-        elif progress["status"] == "error":
-            progress_text = f"Error: {progress['error']}"
-        else:
-            progress_text = progress["message"]
-        
-        # Return updated values
         return [
-            html.Span([
-                html.I(className=f"{icon} me-2"),
-                f"{process_name}"
-            ], className="d-flex align-items-center"),
-            percentage, 
-            f"{percentage}%" if percentage > 0 else "", 
-            color,
-            progress_text
+            _update_current_progress(_progress_snapshot(current_progress), previous_progress),
+            dash.no_update if active_processes == previous_processes else active_processes
         ]
     
-    # Callback to update active processes list
-    @app.callback(
-        Output("active-processes-list", "children"),
-        Input("status-interval", "n_intervals"),
-    )
-    def update_active_processes_list(n_intervals):
+    # Progress display formatting only depends on the raw progress data, so it
+    # runs in the browser
+    app.clientside_callback(
         """
-        Update the list of active processes.
-        
-        Args:
-            n_intervals: Number of interval refreshes
+        function(progress) {
+            var span = function(children, className) {
+                return {namespace: "dash_html_components", type: "Span", props: {children: children, className: className}};
+            };
+            var icon = function(className) {
+                return {namespace: "dash_html_components", type: "I", props: {className: className + " me-2"}};
+            };
             
-        Returns:
-            List of active process components
+            if (!progress) {
+                return [span([icon("fas fa-hourglass"), "No Active Process"]), 0, "", "primary", "No active process running"];
+            }
+            
+            var percentage = progress.percentage;
+            var color = "primary";
+            var iconClass = "fas fa-sync fa-spin";
+            var text = progress.message;
+            if (progress.status === "running") {
+                text = progress.message + " - " + progress.processed_items + " of " + progress.total_items +
+                    " items (" + percentage + "% complete)";
+            } else if (progress.status === "completed") {
+                color = "success";
+                iconClass = "fas fa-check-circle";
+                text = progress.message + " in " + progress.duration;
+            } else if (progress.status === "error") {
+                color = "danger";
+                iconClass = "fas fa-exclamation-circle";
+                text = "Error: " + progress.error;
+            }
+            
+            return [
+                span([icon(iconClass), progress.process_name], "d-flex align-items-center"),
+                percentage,
+                percentage > 0 ? percentage + "%" : "",
+                color,
+                text
+            ];
+        }
+        """,
+        [Output("current-process", "children"),
+         Output("progress-bar", "value"),
+         Output("progress-bar", "label"),
+         Output("progress-bar", "color"),
+         Output("progress-text", "children")],
+        Input("current-progress", "data"),
+        prevent_initial_call=True
+    )
+    
+    # Active process cards are built in the browser from the small process
+    # list, so the server never serializes the card component trees
+    app.clientside_callback(
         """
-        # Get progress directory
-        progress_dir = os.path.join("output", ".progress")
-        if not os.path.exists(progress_dir):
-            return html.P("No active processes", className="text-muted")
-        
-        # Check all JSON files except current.json
-        process_files = [f for f in os.listdir(progress_dir) 
-                        if f.endswith('.json') and f != 'current.json']
-        
-        active_processes = []
-        for file in process_files:
-            try:
-                with open(os.path.join(progress_dir, file), 'r') as f:
-                    process_data = json.load(f)
-                    
-                # Only include recent active processes (last 5 minutes)
-                if process_data.get("status") == "running":
-                    # Check if recently updated
-                    if "start_time" in process_data:
-                        try:
-                            start_time = datetime.fromisoformat(process_data["start_time"])
-                            if (datetime.now() - start_time).total_seconds() < 300:
-                                active_processes.append(process_data)
-                        except (ValueError, TypeError):
-                            # Skip if time parsing fails
-                            continue
-            except Exception:
-                continue
-        
-        if not active_processes:
-            return html.Div([
-                html.P("No active processes", className="text-muted"),
-                html.P([
-                    html.I(className="fas fa-info-circle me-2"),
-                    "Run an automation tool to see process status here"
-                ], className="text-primary small mt-3")
-            ], className="text-center p-4")
-        
-        # Create list of active processes with enhanced UI
-        import dash_bootstrap_components as dbc
+        function(processes) {
+            var el = function(namespace, type, props) {
+                return {namespace: namespace, type: type, props: props};
+            };
+            var h = function(type, props) { return el("dash_html_components", type, props); };
+            var dbc = function(type, props) { return el("dash_bootstrap_components", type, props); };
+            
+            if (!processes || !processes.length) {
+                return h("Div", {className: "text-center p-4", children: [
+                    h("P", {children: "No active processes", className: "text-muted"}),
+                    h("P", {className: "text-primary small mt-3", children: [
+                        h("I", {className: "fas fa-info-circle me-2"}),
+                        "Run an automation tool to see process status here"
+                    ]})
+                ]});
+            }
+            
+            return processes.map(function(process, i) {
+                // Animation delay class for the cascade effect (limit to 5 items)
+                var delay_class = "fade-in-cascade-" + Math.min(i + 1, 5);
+                var percentage = process.percentage;
+                return dbc("Card", {
+                    className: "mb-3 shadow-sm active-process-card fade-in " + delay_class,
+                    children: dbc("CardBody", {className: "p-3", children: [
+                        h("Div", {className: "d-flex align-items-center mb-3", children: [
+                            h("Div", {className: "processing-spinner"}),
+                            h("Span", {children: process.name, className: "fw-bold ms-2"})
+                        ]}),
+                        h("P", {children: process.message, className: "text-muted small mb-3"}),
+                        dbc("Progress", {
+                            value: percentage,
+                            label: percentage > 20 ? percentage + "%" : "",
+                            className: "mb-2 animated-progress",
+                            style: {height: "8px"}
+                        }),
+                        h("Div", {className: "d-flex justify-content-between mt-2", children: [
+                            h("Span", {
+                                children: process.processed_items + " of " + process.total_items + " items",
+                                className: "small text-primary"
+                            }),
+                            h("Span", {children: "Started: " + process.started, className: "small text-muted ms-auto"})
+                        ]})
+                    ]})
+                });
+            });
+        }
+        """,
+        Output("active-processes-list", "children"),
+        Input("active-processes-data", "data"),
+        prevent_initial_call=True
+    )
+
+def _progress_snapshot(progress):
+    """
+    Reduce progress data to the fields the progress display uses.
+    
+    The duration is rewritten on every progress update but only shown once the
+    process has finished, so it is dropped while running; otherwise an
+    unchanged process would still look changed on every tick.
+    
+    Args:
+        progress: Progress data for the current process, or None
         
-        process_list = []
+    Returns:
+        Dictionary of displayed progress fields, or None
+    """
+    if not progress:
+        return None
+    
+    snapshot = {field: progress.get(field) for field in _PROGRESS_DISPLAY_FIELDS}
+    if snapshot["status"] == "running":
+        snapshot["duration"] = None
+    return snapshot
+
+def _update_current_progress(progress, previous_progress):
+    """
+    Build the current-progress store update, sending only the fields that changed.
+    
+    Args:
+        progress: Snapshot of the current progress data
+        previous_progress: Progress data currently held in the store
         
-        # Sort processes by percentage completed (descending)
-        active_processes.sort(key=lambda x: x.get("percentage", 0), reverse=True)
+    Returns:
+        no_update if nothing changed, a Patch of the changed fields when the
+        same process is still reported, otherwise the full progress data
+    """
+    if progress == previous_progress:
+        return dash.no_update
+    
+    if not progress or not previous_progress:
+        return progress
+    
+    patch = Patch()
+    for key, value in progress.items():
+        if previous_progress.get(key) != value:
+            patch[key] = value
+    for key in previous_progress.keys() - progress.keys():
+        del patch[key]
+    
+    return patch
+
+def _select_active_processes(processes):
+    """
+    Select the recently started running processes.
+    
+    Args:
+        processes: Progress data dictionaries for all tracked processes
         
-        # Add cascade effect with different animation delays
-        for i, process in enumerate(active_processes):
-            # Calculate animation delay class (limit to 5 items)
-            delay_class = f"fade-in-cascade-{min(i+1, 5)}"
-            
-            # Calculate process percentage
-            percentage = process.get("percentage", 0)
-            
-            # Create process card with animation
-            process_card = dbc.Card([
-                dbc.CardBody([
-                    html.Div([
-                        html.Div(className="processing-spinner"),
-                        html.Span(process.get("process_name", "Unknown Process"), 
-                                className="fw-bold ms-2")
-                    ], className="d-flex align-items-center mb-3"),
-                    
-                    html.P(process.get("message", "Processing..."), 
-                          className="text-muted small mb-3"),
-                    
-                    dbc.Progress(
-                        value=percentage,
-                        label=f"{percentage}%" if percentage > 20 else "",
-                        className="mb-2 animated-progress",
-                        style={"height": "8px"}
-                    ),
-                    
-                    html.Div([
-                        html.Span(f"{process.get('processed_items', 0)} of {process.get('total_items', 0)} items", 
-                                className="small text-primary"),
-                        html.Span(f"Started: {_format_time(process.get('start_time', ''))}", 
-                                className="small text-muted ms-auto")
-                    ], className="d-flex justify-content-between mt-2")
-                ], className="p-3")
-            ], className=f"mb-3 shadow-sm active-process-card fade-in {delay_class}")
-            
-            process_list.append(process_card)
+    Returns:
+        List of process data dictionaries sorted by percentage (descending)
+    """
+    active_processes = []
+    for process_data in processes:
+        # Only include recent active processes (last 5 minutes)
+        if process_data.get("status") == "running":
+            # Check if recently updated
+            if "start_time" in process_data:
+                try:
+                    start_time = parse_timestamp(process_data["start_time"])
+                    if (datetime.now() - start_time).total_seconds() < 300:
+                        active_processes.append(process_data)
+                except (ValueError, TypeError):
+                    # Skip if time parsing fails
+                    continue
+    
+    # Sort processes by percentage completed (descending)
+    active_processes.sort(key=lambda x: x.get("percentage", 0), reverse=True)
+    
+    return active_processes
+
+def _process_card_data(process):
+    """
+    Reduce a process's progress data to the values its card shows.
+    
+    Args:
+        process: Process data dictionary
         
-        return html.Div(process_list)
+    Returns:
+        Dictionary of the process card values
+    """
+    return {
+        "name": process.get("process_name", "Unknown Process"),
+        "message": process.get("message", "Processing..."),
+        "percentage": process.get("percentage", 0),
+        "processed_items": process.get("processed_items", 0),
+        "total_items": process.get("total_items", 0),
+        "started": _format_time(process.get("start_time", ""))
+    }
 
+@functools.lru_cache(maxsize=512)
 def _format_time(timestamp_str):
     """Format a timestamp string to a readable format."""
     if not timestamp_str:
@@ -218,7 +284,9 @@ def _format_time(timestamp_str):
     
     try:
         # Parse ISO format timestamp
-        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+        if timestamp_str.endswith("Z"):
+            timestamp_str = timestamp_str[:-1] + "+00:00"
+        dt = datetime.fromisoformat(timestamp_str)
         
         # Format as readable time
         return dt.strftime("%H:%M:%S")
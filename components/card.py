@@ -1,148 +1,99 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-import os
-import json
-from datetime import datetime
+import functools
 
-def create_status_card():
+# Shared classNames and styles for dashboard cards
+_CARD_CLS = "h-100 shadow"
+_CARD_TITLE_CLS = "card-title d-flex align-items-center"
+_RUNNING_BADGE_CLS = "status-badge status-badge-running"
+_SPINNER_CLS = "processing-spinner"
+_DIVIDER_CLS = "my-3"
+_ROW_CLS = "mb-3"
+_LOG_OUTPUT_STYLE = {"maxHeight": "250px", "overflowY": "auto"}
+
+# Card icon for each script ID
+SCRIPT_ICONS = {
+    "alert-media": "fas fa-bell",
+    "coordination-notes": "fas fa-clipboard",
+    "patients": "fas fa-user",
+    "weekly-appointments": "fas fa-calendar-alt",
+    "workers": "fas fa-users"
+}
+
+@functools.lru_cache(maxsize=None)
+def _create_api_details_body(api_details):
     """
-    Create a modern status card displaying system information and processing progress.
+    Create the body of a script card's API details modal as a single Markdown component.
     
+    The first entry is shown as a lead paragraph; entries starting with "•" are
+    shown as checklist items and the rest as plain paragraphs.
+    
+    Args:
+        api_details: Tuple of API detail strings, or None
+        
     Returns:
-        dash component: A dbc.Card component
+        dash component: A dcc.Markdown component
     """
-    # Get environment information
-    environment = os.getenv("ENV", "Production")
-    api_base_url = os.getenv("API_BASE_URL", "https://api.hchb.com/fhir/r4")
+    if not api_details:
+        return dcc.Markdown("", className="modal-details")
     
-    # Check if connection details are available
-    connected = all([
-        os.getenv("CLIENT_ID"),
-        os.getenv("RESOURCE_SECURITY_ID"),
-        os.getenv("AGENCY_SECRET"),
-        os.getenv("TOKEN_URL")
-    ])
+    lines = [api_details[0], ""]
+    for detail in api_details[1:]:
+        if detail.startswith("•"):
+            lines.append(f"- {detail[1:].strip()}")
+        else:
+            lines.extend(["", detail, ""])
     
-    # Create status card
-    return dbc.Card([
-        dbc.CardHeader([
-            html.H4([
-                html.I(className="fas fa-server me-2"),
-                "System Status"
-            ], className="card-title d-flex align-items-center"),
-        ]),
-        dbc.CardBody([
-            html.Div([
-                dbc.Row([
-                    dbc.Col(html.P("API Connection:", className="fw-bold"), width="auto"),
-                    dbc.Col(
-                        html.P([
-                            html.I(className="fas fa-circle me-2 fa-xs"),
-                            "Connected to HCHB FHIR API" if connected else "Not connected to API"
-                        ], id="api-status", className="d-flex align-items-center text-success" if connected else "d-flex align-items-center text-danger")
-                    )
-                ], className="mb-3"),
-                html.Hr(className="my-3"),
-                
-                dbc.Row([
-                    dbc.Col(html.P("API Endpoint:", className="fw-bold"), width="auto"),
-                    dbc.Col(html.P(api_base_url, className="text-primary"))
-                ], className="mb-3"),
-                html.Hr(className="my-3"),
-                
-                dbc.Row([
-                    dbc.Col(html.P("Last Data Refresh:", className="fw-bold"), width="auto"),
-                    dbc.Col(html.Div(id="last-refresh"))
-                ], className="mb-3"),
-                html.Hr(className="my-3"),
-                
-                # Active Processes Section
-                dbc.Row([
-                    dbc.Col(html.P("Active Processes:", className="fw-bold"), width="auto"),
-                    dbc.Col(html.Div(id="active-processes", children="None", className="fw-bold text-primary"))
-                ], className="mb-3"),
-                
-                # Current Process Status with Enhanced Indicator
-                html.Div([
-                    html.Div(id="process-status-indicator", className="status-badge status-badge-running", style={"display": "none"}, children=[
-                        html.Div(className="processing-spinner"),
-                        html.Span(id="current-process", children="None")
-                    ]),
-                    
-                    dbc.Progress(
-                        id="progress-bar", 
-                        value=0, 
-                        label="0%",
-                        style={"height": "12px"}, 
-                        className="mb-2"
-                    ),
-                    html.P(id="progress-text", children="No active process", className="text-muted fs-6")
-                ], className="mb-3"),
-                html.Hr(className="my-3"),
-                
-                dbc.Row([
-                    dbc.Col(html.P("Environment:", className="fw-bold"), width="auto"),
-                    dbc.Col(html.P([
-                        html.I(className="fas fa-cog me-2"),
-                        environment
-                    ], className="text-primary d-flex align-items-center"))
-                ], className="mb-3"),
-                html.Hr(className="my-3"),
-                
-                dbc.Row([
-                    dbc.Col(html.P("Output Directory:", className="fw-bold"), width="auto"),
-                    dbc.Col(html.P([
-                        html.I(className="fas fa-folder-open me-2"),
-                        os.getenv("OUTPUT_DIRECTORY", "output")
-                    ], className="text-primary d-flex align-items-center"))
-                ], className="mb-3"),
-            ]),
-        ]),
-    ], className="h-100 shadow")
+    return dcc.Markdown("\n".join(lines), className="modal-details")
 
-def create_script_card(title, description, script_id, script_path, api_details=None):
+def get_api_details_body(api_details):
+    """
+    Get the API details modal body for a script card.
+    
+    Args:
+        api_details: Tuple of API detail strings for the script, or None
+        
+    Returns:
+        dash component: A dcc.Markdown component
+    """
+    return _create_api_details_body(api_details)
+
+@functools.lru_cache(maxsize=None)
+def create_script_card(title, description, script_id):
     """
     Create a modern script card for running automation scripts with enhanced loading indicators.
     
+    Cards are memoized on their arguments, so callers must not mutate the
+    returned component.
+    
     Args:
         title: Title of the script card
         description: Description of the script
         script_id: Unique ID for the script
-        script_path: Path to the script module
-        api_details: List of API details for the modal
         
     Returns:
         dash component: A dbc.Card component
     """
-    # Define icon based on script ID
-    icons = {
-        "alert-media": "fas fa-bell",
-        "coordination-notes": "fas fa-clipboard",
-        "patients": "fas fa-user",
-        "weekly-appointments": "fas fa-calendar-alt",
-        "workers": "fas fa-users"
-    }
-    
-    icon_class = icons.get(script_id, "fas fa-cogs")
+    icon_class = f"{SCRIPT_ICONS.get(script_id, 'fas fa-cogs')} me-2"
     
     # Create the script card
     return dbc.Card([
         # Status Badge (initially hidden)
         html.Div(
             id={"type": "status-badge", "index": script_id},
-            className="status-badge status-badge-running",
+            className=_RUNNING_BADGE_CLS,
             style={"display": "none"},
             children=[
-                html.Div(className="processing-spinner"),
+                html.Div(className=_SPINNER_CLS),
                 html.Span("Processing...")
             ]
         ),
         
         dbc.CardHeader([
             html.H4([
-                html.I(className=f"{icon_class} me-2"),
+                html.I(className=icon_class),
                 title
-            ], className="card-title d-flex align-items-center"),
+            ], className=_CARD_TITLE_CLS),
         ]),
         
         # Card Body with Position Relative for Overlay
@@ -186,7 +137,7 @@ def create_script_card(title, description, script_id, script_path, api_details=N
             
             # Log container
             html.Div([
-                html.Hr(className="my-3"),
+                html.Hr(className=_DIVIDER_CLS),
                 html.H5([
                     html.I(className="fas fa-terminal me-2"),
                     "Execution Log:"
@@ -200,15 +151,18 @@ def create_script_card(title, description, script_id, script_path, api_details=N
                         # Status indicator
                         html.Div(
                             id={"type": "script-status", "index": script_id},
-                            className="mb-3",
+                            className=_ROW_CLS,
                             style={"display": "none"}
                         ),
                         
+                        # Result of the last run ("ok" or "err")
+                        dcc.Store(id={"type": "script-status-code", "index": script_id}),
+                        
                         # Output area
                         html.Div(
                             id={"type": "script-output", "index": script_id}, 
                             className="log-output",
-                            style={"maxHeight": "250px", "overflowY": "auto"}
+                            style=_LOG_OUTPUT_STYLE
                         )
                     ]
                 )
@@ -218,23 +172,11 @@ def create_script_card(title, description, script_id, script_path, api_details=N
         # Modal for API Details
         dbc.Modal([
             dbc.ModalHeader(dbc.ModalTitle([
-                html.I(className=f"{icon_class} me-2"),
+                html.I(className=icon_class),
                 f"{title} - API Details"
             ])),
-            dbc.ModalBody([
-                html.Div([
-                    html.P(api_details[0], className="lead mb-4") if api_details and len(api_details) > 0 else None,
-                    *[
-                        html.P(detail, className="mb-3") 
-                        if not detail.startswith("•") else 
-                        html.Div([
-                            html.I(className="fas fa-check-circle me-2 text-primary"),
-                            detail[1:].strip()
-                        ], className="mb-2 d-flex align-items-center")
-                        for detail in (api_details[1:] if api_details and len(api_details) > 1 else [])
-                    ]
-                ])
-            ]),
+            # Filled in on first open to keep the initial layout small
+            dbc.ModalBody(id={"type": "modal-body", "index": script_id}),
             dbc.ModalFooter(
                 dbc.Button([
                     html.I(className="fas fa-times me-2"),
@@ -243,5 +185,5 @@ def create_script_card(title, description, script_id, script_path, api_details=N
             ),
         ], id={"type": "modal", "index": script_id}, is_open=False, size="lg", scrollable=True),
     ], 
-    className="h-100 shadow", 
+    className=_CARD_CLS, 
     id={"type": "script-card", "index": script_id})
\ No newline at end of file
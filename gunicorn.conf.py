@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for serving the dashboard in production.
+
+Start with: gunicorn -c gunicorn.conf.py app:server
+"""
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8050")
+
+# Build the app (layout, callbacks) once in the master and share it with the
+# forked workers
+preload_app = True
+
+# Requests are mostly I/O bound (status and background job polling), so use a
+# few processes with many threads each
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Script runs are background callbacks, so no request stays open for the
+# length of a run and gunicorn's default worker timeout is enough
+timeout = 30
\ No newline at end of file
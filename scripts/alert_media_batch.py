@@ -14,7 +14,7 @@ Uses shared utilities for:
 
 import time
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 import os
 
@@ -24,12 +24,39 @@ from utils.sharepoint_client import sharepoint_client
 from utils.logging_setup import configure_logging
 from utils.progress_tracker import ProgressTracker
 from utils.config import (
-    BATCH_SIZE, MAX_WORKERS, PATIENT_BATCH_SIZE, OUTPUT_DIRECTORY
+    BATCH_SIZE, MAX_WORKERS, PATIENT_BATCH_SIZE, OUTPUT_DIRECTORY, FHIR_BUNDLE_SIZE
 )
 
 # Configure logging
 logger = configure_logging('patients_csv')
 
+# Known O2 medication IDs
+O2_MEDICATION_IDS = frozenset([
+    "zxiqm1e9pad",  # OXYGEN
+    "ezi36d75lcl",  # O2 - OXYGEN
+    "mpi76en0iq",   # oxygen gas for inhalation
+    "mpi7d4qr3sq",  # O2 - OXYGEN - PORTABLE
+    "67i957z4xho"   # O2 - OXYGEN - CPAP
+])
+
+# Keywords that indicate oxygen medication
+O2_KEYWORDS = [
+    "oxygen", "o2", "concentrator", "portable oxygen", "continuous oxygen",
+    "liquid oxygen", "nasal cannula", "oxygen tank", "cpap", "bipap", 
+    "ventilator", "respiratory", "breathing", "inhalation", "home oxygen"
+]
+
+# Dosage keywords related to oxygen
+DOSAGE_KEYWORDS = [
+    "continuous", "prn", "as needed", "as directed", "bedtime", "daily",
+    "liters", "lpm", "l/min", "nocturnal", "o2 sat"
+]
+
+# Each keyword list compiled into a single case-insensitive pattern, so a text
+# is scanned once rather than once per keyword
+_O2_KEYWORDS_RE = re.compile("|".join(map(re.escape, O2_KEYWORDS)), re.IGNORECASE)
+_DOSAGE_KEYWORDS_RE = re.compile("|".join(map(re.escape, DOSAGE_KEYWORDS)), re.IGNORECASE)
+
 def normalize_phone_number(phone_number):
     """
     Normalize phone number format to ensure consistency.
@@ -128,27 +155,46 @@ def get_patient_locations_batch(patient_ids, progress_tracker=None):
     patient_locations = {}
     location_cache = {}  # Cache location details to avoid redundant API calls
     
-    # Process batches with ThreadPoolExecutor
-    batch_count = 0
-    for batch in batches:
-        batch_count += 1
-        logger.info(f"Processing location batch {batch_count}/{len(batches)}")
-        
-        # Update progress tracker
-        if progress_tracker:
-            progress_tracker.update(progress_tracker.processed_items, 
-                                   f"Processing location batch {batch_count}/{len(batches)}")
-        
-        # Process batch in parallel
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Map each patient ID to a function that gets its location
+    # Process batches with a single ThreadPoolExecutor shared by every batch
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        batch_count = 0
+        for batch in batches:
+            batch_count += 1
+            logger.info(f"Processing location batch {batch_count}/{len(batches)}")
+            
+            # Update progress tracker
+            if progress_tracker:
+                progress_tracker.update(progress_tracker.processed_items, 
+                                       f"Processing location batch {batch_count}/{len(batches)}")
+            
+            # Search encounters for several patients at once, in parallel
+            bundle_chunks = [batch[i:i+FHIR_BUNDLE_SIZE] for i in range(0, len(batch), FHIR_BUNDLE_SIZE)]
+            future_to_chunk = {
+                executor.submit(_get_patient_locations_bundle, chunk, location_cache): chunk
+                for chunk in bundle_chunks
+            }
+            
+            unresolved_patient_ids = []
+            for future in as_completed(future_to_chunk):
+                chunk = future_to_chunk[future]
+                try:
+                    chunk_locations, chunk_unresolved = future.result()
+                except Exception as e:
+                    logger.error(f"Error retrieving encounters for {len(chunk)} patients: {e}")
+                    chunk_locations, chunk_unresolved = {}, chunk
+                
+                patient_locations.update(chunk_locations)
+                unresolved_patient_ids.extend(chunk_unresolved)
+            
+            # Patients the shared search could not settle are looked up one
+            # at a time
             future_to_patient = {
                 executor.submit(_get_patient_location, patient_id, location_cache): patient_id 
-                for patient_id in batch
+                for patient_id in unresolved_patient_ids
             }
             
             # Process completed tasks
-            for future in future_to_patient:
+            for future in as_completed(future_to_patient):
                 patient_id = future_to_patient[future]
                 try:
                     location_data = future.result()
@@ -168,6 +214,88 @@ def get_patient_locations_batch(patient_ids, progress_tracker=None):
     
     return patient_locations
 
+def _get_patient_locations_bundle(patient_ids, location_cache):
+    """
+    Get location data for several patients from a single encounter search.
+    
+    The encounters of all patients are searched at once (a comma-separated
+    subject matches any of them) with their locations included in the same
+    bundle. If the results do not fit on one page, patients with no located
+    encounter on it are left unresolved so the caller can look them up
+    individually.
+    
+    Args:
+        patient_ids: List of patient IDs (at most FHIR_BUNDLE_SIZE)
+        location_cache: Shared cache for location resources
+        
+    Returns:
+        Tuple of (patient_locations, unresolved_patient_ids) where
+        patient_locations maps patient IDs to location data
+    """
+    params = {
+        "subject": ",".join(f"Patient/{patient_id}" for patient_id in patient_ids),
+        "_include": "Encounter:location",
+        "_sort": "-date",
+        "_count": str(len(patient_ids) * 10)
+    }
+    
+    bundle = fhir_client.search_resources("Encounter", params=params)
+    if not bundle:
+        return {}, list(patient_ids)
+    
+    # Without a next page, every matching encounter has been returned
+    complete = not any(link.get("relation") == "next" for link in bundle.get("link", []))
+    
+    # Group encounters by patient; the bundle is sorted by date, so each
+    # patient's encounters stay most recent first
+    encounters_by_patient = {}
+    included_locations = {}
+    for entry in bundle.get("entry", []):
+        resource = entry.get("resource")
+        if not resource:
+            continue
+        if resource["resourceType"] == "Encounter":
+            subject = resource.get("subject", {}).get("reference", "")
+            encounters_by_patient.setdefault(subject.replace("Patient/", ""), []).append(resource)
+        elif resource["resourceType"] == "Location" and "id" in resource:
+            included_locations[resource["id"]] = resource
+    
+    patient_locations = {}
+    unresolved_patient_ids = []
+    for patient_id in patient_ids:
+        location_id = _find_encounter_location_id(encounters_by_patient.get(patient_id, []))
+        if location_id:
+            county, phone = _get_location_details(location_id, included_locations, location_cache)
+            patient_locations[patient_id] = {
+                "county": county,
+                "phone": phone,
+                "location_id": location_id
+            }
+        elif complete:
+            # No location in encounters, try to get at least phone from patient
+            patient_locations[patient_id] = {
+                "county": None,
+                "phone": None,
+                "location_id": None
+            }
+        else:
+            unresolved_patient_ids.append(patient_id)
+    
+    # If we didn't get a phone from the location, try the patient resources
+    missing_phone = [patient_id for patient_id, data in patient_locations.items() if not data["phone"]]
+    if missing_phone:
+        patients = fhir_client.batch_read([f"Patient/{patient_id}" for patient_id in missing_phone])
+        for patient_id, patient in zip(missing_phone, patients):
+            patient_locations[patient_id]["phone"] = _extract_patient_phone(patient)
+    
+    # Patients with neither a location nor a phone have no location data
+    patient_locations = {
+        patient_id: data for patient_id, data in patient_locations.items()
+        if data["location_id"] or data["phone"]
+    }
+    
+    return patient_locations, unresolved_patient_ids
+
 def _get_patient_location(patient_id, location_cache):
     """
     Get location data for a single patient.
@@ -181,55 +309,28 @@ def _get_patient_location(patient_id, location_cache):
     """
     try:
         # First, get the patient's recent encounters
-        encounters = _get_patient_encounters(patient_id)
-        
-        if encounters:
-            # Extract location from the most recent encounter with a location
-            location_id = None
-            for encounter in encounters:
-                if "location" in encounter and encounter["location"]:
-                    for loc in encounter["location"]:
-                        if "location" in loc and "reference" in loc["location"]:
-                            location_ref = loc["location"]["reference"]
-                            if location_ref.startswith("Location/"):
-                                location_id = location_ref.replace("Location/", "")
-                                break
-                    if location_id:
-                        break
+        encounters, included_locations = _get_patient_encounters(patient_id)
+        
+        # Extract location from the most recent encounter with a location
+        location_id = _find_encounter_location_id(encounters)
+        
+        # If we found a location reference, get the location details
+        if location_id:
+            county, phone = _get_location_details(location_id, included_locations, location_cache)
             
-            # If we found a location reference, get the location details
-            if location_id:
-                # Check cache first
-                if location_id in location_cache:
-                    county, phone = location_cache[location_id]
-                else:
-                    # Get location details from API
-                    location = fhir_client.get_resource("Location", location_id)
-                    county, phone = _extract_location_details(location)
-                    location_cache[location_id] = (county, phone)
-                
-                # If we didn't get a phone from the location, try the patient resource
-                if not phone:
-                    patient_phone = _get_patient_phone(patient_id)
-                    phone = patient_phone
-                
-                # Store location data
-                return {
-                    "county": county,
-                    "phone": phone,
-                    "location_id": location_id
-                }
-            else:
-                # No location in encounters, try to get at least phone from patient
+            # If we didn't get a phone from the location, try the patient resource
+            if not phone:
                 patient_phone = _get_patient_phone(patient_id)
-                if patient_phone:
-                    return {
-                        "county": None,
-                        "phone": patient_phone,
-                        "location_id": None
-                    }
+                phone = patient_phone
+            
+            # Store location data
+            return {
+                "county": county,
+                "phone": phone,
+                "location_id": location_id
+            }
         else:
-            # No encounters found, try to get at least phone from patient
+            # No location in encounters, try to get at least phone from patient
             patient_phone = _get_patient_phone(patient_id)
             if patient_phone:
                 return {
@@ -243,15 +344,63 @@ def _get_patient_location(patient_id, location_cache):
     
     return None
 
-def _get_patient_encounters(patient_id):
+def _find_encounter_location_id(encounters):
+    """
+    Find the location of the most recent encounter that has one.
+    
+    Args:
+        encounters: Encounter resources sorted by date (most recent first)
+        
+    Returns:
+        Location ID string or None if no encounter has a location
+    """
+    for encounter in encounters:
+        for loc in encounter.get("location") or []:
+            location_ref = loc.get("location", {}).get("reference", "")
+            if location_ref.startswith("Location/"):
+                return location_ref.replace("Location/", "")
+    return None
+
+def _get_location_details(location_id, included_locations, location_cache):
+    """
+    Get the county and phone of a location.
+    
+    Args:
+        location_id: The location ID
+        included_locations: Location resources returned alongside the encounters, by ID
+        location_cache: Shared cache for location details
+        
+    Returns:
+        Tuple of (county, phone)
+    """
+    # Check cache first
+    if location_id in location_cache:
+        return location_cache[location_id]
+    
+    if location_id in included_locations:
+        # Location was returned alongside the encounters
+        location = included_locations[location_id]
+    else:
+        # Get location details from API
+        location = fhir_client.get_resource("Location", location_id)
+    
+    details = _extract_location_details(location)
+    location_cache[location_id] = details
+    return details
+
+def _get_patient_encounters(patient_id, include_location=True):
     """
     Get recent encounters for a patient.
     
     Args:
         patient_id: The patient ID
+        include_location: Whether to have the server include the encounters'
+            Location resources in the same bundle
         
     Returns:
-        List of encounter resources sorted by date (most recent first)
+        Tuple of (encounters, locations) where encounters is a list of encounter
+        resources sorted by date (most recent first) and locations maps the IDs
+        of included Location resources to the resources
     """
     try:
         # Parameters to get multiple recent encounters
@@ -260,24 +409,33 @@ def _get_patient_encounters(patient_id):
             "_sort": "-date",         # Sort by date descending (most recent first)
             "_count": "10"            # Get several recent encounters
         }
+        if include_location:
+            # Return the referenced locations in the same bundle to save a
+            # request per location
+            params["_include"] = "Encounter:location"
         
         # Use FHIR client to get encounters
-        bundle = fhir_client.get_resource("Encounter", params=params)
+        bundle = fhir_client.search_resources("Encounter", params=params)
         
         encounters = []
+        locations = {}
         
         # Check if encounters were found
         if "entry" in bundle and bundle["entry"]:
             for entry in bundle["entry"]:
-                if "resource" in entry and entry["resource"]["resourceType"] == "Encounter":
-                    encounter = entry["resource"]
-                    encounters.append(encounter)
+                resource = entry.get("resource")
+                if not resource:
+                    continue
+                if resource["resourceType"] == "Encounter":
+                    encounters.append(resource)
+                elif resource["resourceType"] == "Location" and "id" in resource:
+                    locations[resource["id"]] = resource
         
-        return encounters
+        return encounters, locations
         
     except Exception as e:
         logger.error(f"Error getting encounters for patient {patient_id}: {e}")
-        return []
+        return [], {}
 
 def _extract_location_details(location):
     """
@@ -320,26 +478,37 @@ def _get_patient_phone(patient_id):
     try:
         # Get patient resource
         patient = fhir_client.get_resource("Patient", patient_id)
-        
-        # Try to get phone from telecom section
-        if "telecom" in patient:
-            # First prioritize home phone
-            for telecom in patient["telecom"]:
-                if telecom.get("system") == "phone" and telecom.get("use") == "home":
-                    return normalize_phone_number(telecom.get("value"))
-            
-            # Then try any phone
-            for telecom in patient["telecom"]:
-                if telecom.get("system") == "phone":
-                    return normalize_phone_number(telecom.get("value"))
-        
-        # No phone number found
-        return None
+        return _extract_patient_phone(patient)
         
     except Exception as e:
         logger.error(f"Error retrieving phone number for patient {patient_id}: {e}")
         return None
 
+def _extract_patient_phone(patient):
+    """
+    Extract a phone number from a patient resource, preferring the home phone.
+    
+    Args:
+        patient: Patient resource, or None
+        
+    Returns:
+        Phone number string or None if not found
+    """
+    # Try to get phone from telecom section
+    if patient and "telecom" in patient:
+        # First prioritize home phone
+        for telecom in patient["telecom"]:
+            if telecom.get("system") == "phone" and telecom.get("use") == "home":
+                return normalize_phone_number(telecom.get("value"))
+        
+        # Then try any phone
+        for telecom in patient["telecom"]:
+            if telecom.get("system") == "phone":
+                return normalize_phone_number(telecom.get("value"))
+    
+    # No phone number found
+    return None
+
 def get_patient_o2_status_batch(patient_ids, progress_tracker=None):
     """
     Check if patients have oxygen-related medication in batches.
@@ -358,65 +527,47 @@ def get_patient_o2_status_batch(patient_ids, progress_tracker=None):
         progress_tracker.update(progress_tracker.processed_items, 
                                f"Checking O2 status for {len(patient_ids)} patients")
     
-    # Known O2 medication IDs and keywords
-    known_o2_medication_ids = [
-        "zxiqm1e9pad",  # OXYGEN
-        "ezi36d75lcl",  # O2 - OXYGEN
-        "mpi76en0iq",   # oxygen gas for inhalation
-        "mpi7d4qr3sq",  # O2 - OXYGEN - PORTABLE
-        "67i957z4xho"   # O2 - OXYGEN - CPAP
-    ]
-    
-    o2_keywords = [
-        "oxygen", "o2", "concentrator", "portable oxygen", "continuous oxygen",
-        "liquid oxygen", "nasal cannula", "oxygen tank", "cpap", "bipap", 
-        "ventilator", "respiratory", "breathing", "inhalation", "home oxygen"
-    ]
-    
-    dosage_keywords = [
-        "continuous", "prn", "as needed", "as directed", "bedtime", "daily",
-        "liters", "lpm", "l/min", "nocturnal", "o2 sat"
-    ]
-    
     # Create batches for processing
     batches = [patient_ids[i:i+BATCH_SIZE] for i in range(0, len(patient_ids), BATCH_SIZE)]
     o2_status = {patient_id: False for patient_id in patient_ids}  # Initialize all to False
     match_reasons = {}  # Track matches for logging
     
-    # Process batches with ThreadPoolExecutor
-    batch_count = 0
-    for batch in batches:
-        batch_count += 1
-        logger.info(f"Processing O2 status batch {batch_count}/{len(batches)}")
-        
-        # Update progress tracker
-        if progress_tracker:
-            progress_tracker.update(progress_tracker.processed_items, 
-                                   f"Processing O2 status batch {batch_count}/{len(batches)}")
-        
-        # Process this batch in parallel
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Create a function that checks O2 status for each patient
-            future_to_patient = {
-                executor.submit(
-                    _check_patient_o2_status, 
-                    patient_id, 
-                    known_o2_medication_ids,
-                    o2_keywords,
-                    dosage_keywords
-                ): patient_id for patient_id in batch
+    # Process batches with a single ThreadPoolExecutor shared by every batch
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        batch_count = 0
+        for batch in batches:
+            batch_count += 1
+            logger.info(f"Processing O2 status batch {batch_count}/{len(batches)}")
+            
+            # Update progress tracker
+            if progress_tracker:
+                progress_tracker.update(progress_tracker.processed_items, 
+                                       f"Processing O2 status batch {batch_count}/{len(batches)}")
+            
+            # Fetch medication requests for this batch as FHIR batch bundles, in parallel
+            bundle_chunks = [batch[i:i+FHIR_BUNDLE_SIZE] for i in range(0, len(batch), FHIR_BUNDLE_SIZE)]
+            future_to_chunk = {
+                executor.submit(_get_medication_requests_bundle, chunk): chunk
+                for chunk in bundle_chunks
             }
             
-            # Process results as they complete
-            for future in future_to_patient:
-                patient_id = future_to_patient[future]
+            # Check each patient's medications once their bundle has arrived
+            for future in as_completed(future_to_chunk):
+                chunk = future_to_chunk[future]
                 try:
-                    has_o2, match_reason = future.result()
+                    med_requests_by_patient = future.result()
+                except Exception as e:
+                    logger.error(f"Error retrieving medication requests for {len(chunk)} patients: {e}")
+                    continue
+                
+                for patient_id in chunk:
+                    has_o2, match_reason = _check_patient_o2_status(
+                        patient_id,
+                        med_requests_by_patient.get(patient_id, [])
+                    )
                     o2_status[patient_id] = has_o2
                     if has_o2:
                         match_reasons[patient_id] = match_reason
-                except Exception as e:
-                    logger.error(f"Error checking O2 status for patient {patient_id}: {e}")
     
     # Count patients with O2
     patients_with_o2 = sum(1 for status in o2_status.values() if status)
@@ -436,35 +587,53 @@ def get_patient_o2_status_batch(patient_ids, progress_tracker=None):
     
     return o2_status
 
-def _check_patient_o2_status(patient_id, known_o2_medication_ids, o2_keywords, dosage_keywords):
+def _get_medication_requests_bundle(patient_ids):
+    """
+    Get active and completed medication requests for several patients in one batch request.
+    
+    Args:
+        patient_ids: List of patient IDs (at most FHIR_BUNDLE_SIZE)
+        
+    Returns:
+        Dictionary mapping patient IDs to their list of MedicationRequest resources
+    """
+    # Include both active and completed (recent history might be relevant)
+    request_urls = [
+        f"MedicationRequest?patient=Patient/{patient_id}&status=active,completed&_count=100"
+        for patient_id in patient_ids
+    ]
+    
+    search_bundles = fhir_client.batch_read(request_urls)
+    
+    med_requests_by_patient = {}
+    for patient_id, search_bundle in zip(patient_ids, search_bundles):
+        if search_bundle is None:
+            logger.warning(f"Medication request search failed for patient {patient_id}")
+            continue
+        med_requests_by_patient[patient_id] = [
+            entry["resource"] for entry in search_bundle.get("entry", []) if "resource" in entry
+        ]
+    
+    return med_requests_by_patient
+
+def _check_patient_o2_status(patient_id, med_requests):
     """
     Check if a patient has oxygen-related medication.
     
+    Matches against O2_MEDICATION_IDS, O2_KEYWORDS and DOSAGE_KEYWORDS.
+    
     Args:
         patient_id: The patient ID
-        known_o2_medication_ids: List of known medication IDs for oxygen
-        o2_keywords: List of keywords that indicate oxygen medication
-        dosage_keywords: List of dosage keywords related to oxygen
+        med_requests: The patient's MedicationRequest resources
         
     Returns:
         Tuple of (has_oxygen, match_reason)
     """
     try:
-        # Query to get active AND completed medications for this patient
-        params = {
-            "patient": f"Patient/{patient_id}",
-            # Include both active and completed (recent history might be relevant)
-            "status": "active,completed",
-            "_count": "100"  # Increase to get more potential matches
-        }
-        
-        # Get medication requests for this patient
-        med_requests = fhir_client.get_resources("MedicationRequest", params)
-        
         for med_request in med_requests:
             # Check for known medication IDs
             med_id = med_request.get("id", "")
-            if med_id in known_o2_medication_ids:
+            if med_id in O2_MEDICATION_IDS:
                 return True, f"Matched known ID: {med_id}"
             
             # Check medication display name
@@ -473,7 +642,7 @@ def _check_patient_o2_status(patient_id, known_o2_medication_ids, o2_keywords, d
                 
                 # Check text field
                 med_name = med_concept.get("text", "").lower()
-                if any(keyword.lower() in med_name for keyword in o2_keywords):
+                if _O2_KEYWORDS_RE.search(med_name):
                     return True, f"Matched name: {med_name}"
                 
                 # Check coding array for oxygen codes
@@ -482,11 +651,9 @@ def _check_patient_o2_status(patient_id, known_o2_medication_ids, o2_keywords, d
                         code = coding.get("code", "")
                         display = coding.get("display", "").lower()
                         
-                        # If code matches known pattern for oxygen
-                        if (code.startswith("O2") or 
-                            "oxygen" in display or 
-                            "o2" in display.split() or
-                            any(keyword.lower() in display for keyword in o2_keywords)):
+                        # If code matches known pattern for oxygen ("oxygen"
+                        # and "o2" are among the keywords)
+                        if code.startswith("O2") or _O2_KEYWORDS_RE.search(display):
                             return True, f"Matched coding: {display}"
             
             # Check the dosage instructions
@@ -497,14 +664,14 @@ def _check_patient_o2_status(patient_id, known_o2_medication_ids, o2_keywords, d
                         instruction_text = instruction["text"].lower()
                         
                         # If medication name doesn't have oxygen but dosage mentions it
-                        if any(keyword.lower() in instruction_text for keyword in o2_keywords):
+                        if _O2_KEYWORDS_RE.search(instruction_text):
                             return True, f"Matched dosage text: {instruction_text[:30]}..."
                         
                         # Check for dosage patterns that suggest oxygen
                         if ("medicationCodeableConcept" in med_request and
                             "text" in med_request["medicationCodeableConcept"]):
                             med_name = med_request["medicationCodeableConcept"]["text"].lower()
-                            if (any(kw in instruction_text for kw in dosage_keywords) and
+                            if (_DOSAGE_KEYWORDS_RE.search(instruction_text) and
                                 (med_name.startswith("o2") or "oxygen" in med_name)):
                                 return True, f"Matched dosage pattern: {instruction_text[:30]}..."
             
@@ -522,7 +689,7 @@ def _check_patient_o2_status(patient_id, known_o2_medication_ids, o2_keywords, d
                 for note in med_request["note"]:
                     if "text" in note:
                         note_text = note["text"].lower()
-                        if any(keyword.lower() in note_text for keyword in o2_keywords):
+                        if _O2_KEYWORDS_RE.search(note_text):
                             return True, f"Matched note text: {note_text[:30]}..."
         
         # No oxygen medication found
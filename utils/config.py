@@ -33,6 +33,7 @@ MAX_WORKERS = int(os.getenv('MAX_WORKERS', '5'))
 OUTPUT_DIRECTORY = os.getenv('OUTPUT_DIRECTORY', 'output')
 PATIENT_BATCH_SIZE = int(os.getenv('PATIENT_BATCH_SIZE', '1000'))
 ENCOUNTER_BATCH_SIZE = int(os.getenv('ENCOUNTER_BATCH_SIZE', '100'))
+FHIR_BUNDLE_SIZE = int(os.getenv('FHIR_BUNDLE_SIZE', '50'))
 
 # Coordination Notes Configuration
 SYNC_BUFFER_MINUTES = int(os.getenv('SYNC_BUFFER_MINUTES', '30'))
@@ -82,6 +83,7 @@ def get_config():
         'OUTPUT_DIRECTORY': OUTPUT_DIRECTORY,
         'PATIENT_BATCH_SIZE': PATIENT_BATCH_SIZE,
         'ENCOUNTER_BATCH_SIZE': ENCOUNTER_BATCH_SIZE,
+        'FHIR_BUNDLE_SIZE': FHIR_BUNDLE_SIZE,
         'SYNC_BUFFER_MINUTES': SYNC_BUFFER_MINUTES,
         'MAX_PAGES_PER_REQUEST': MAX_PAGES_PER_REQUEST,
         'PAGE_SIZE': PAGE_SIZE,
@@ -128,6 +130,7 @@ def print_config_summary(include_secrets=False):
     print(f"Batch Size: {BATCH_SIZE}")
     print(f"Patient Batch Size: {PATIENT_BATCH_SIZE}")
     print(f"Encounter Batch Size: {ENCOUNTER_BATCH_SIZE}")
+    print(f"FHIR Bundle Size: {FHIR_BUNDLE_SIZE}")
     print(f"Max Workers: {MAX_WORKERS}")
     print(f"Output Directory: {OUTPUT_DIRECTORY}")
     
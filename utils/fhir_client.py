@@ -3,6 +3,9 @@ FHIR API client for Healing Hands automation scripts.
 Handles authentication, token management, and API requests.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession, DO_NOT_CACHE
+import os
 import socket
 import threading
 import logging
@@ -11,11 +14,21 @@ import time
 # Import configuration
 from utils.config import (
     CLIENT_ID, RESOURCE_SECURITY_ID, AGENCY_SECRET, TOKEN_URL,
-    API_BASE_URL, REQUEST_TIMEOUT, TOKEN_ROTATION_COUNT, MAX_RETRIES
+    API_BASE_URL, REQUEST_TIMEOUT, TOKEN_ROTATION_COUNT, MAX_RETRIES, MAX_WORKERS,
+    OUTPUT_DIRECTORY
 )
 
 logger = logging.getLogger(__name__)
 
+# Response cache for FHIR GETs, stored unencrypted on disk. Only Organization
+# reference data is cached: Location lookups resolve a patient's encounter and
+# Practitioner searches feed the staff export, so both are always fetched fresh,
+# as are patient resources (Patient, Appointment, Encounter, ...).
+_API_HOST_PATH = API_BASE_URL.split("://", 1)[-1].rstrip("/")
+CACHE_EXPIRE_BY_RESOURCE = {
+    f"{_API_HOST_PATH}/Organization*": 86400,
+}
+
 class TokenManager:
     """Manages token rotation for API requests"""
     
@@ -100,6 +113,22 @@ class FHIRClient:
         """Initialize the FHIR client"""
         self.base_url = API_BASE_URL
         
+        # Reuse connections across requests; the scripts call the API from
+        # MAX_WORKERS threads, so size the pool to match. Server Cache-Control
+        # headers are ignored so they cannot opt patient resources into the
+        # on-disk cache, and expired rows are purged when a client starts.
+        self.session = CachedSession(
+            os.path.join(OUTPUT_DIRECTORY, "fhir_cache"),
+            backend="sqlite",
+            expire_after=DO_NOT_CACHE,
+            urls_expire_after=CACHE_EXPIRE_BY_RESOURCE,
+            cache_control=False
+        )
+        self.session.cache.delete(expired=True)
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
     def get_headers(self):
         """Get authentication headers with current token"""
         token = token_manager.get_token()
@@ -108,7 +137,7 @@ class FHIRClient:
             "Accept": "application/fhir+json"
         }
         
-    def make_request(self, endpoint, params=None, headers=None, retry_count=0):
+    def make_request(self, endpoint, params=None, headers=None, retry_count=0, json_body=None):
         """
         Make an API request with token rotation.
         
@@ -117,6 +146,7 @@ class FHIRClient:
             params: Optional request parameters
             headers: Optional request headers (auth will be added)
             retry_count: Current retry attempt
+            json_body: Optional JSON payload; when given the request is sent as a POST
             
         Returns:
             The response JSON
@@ -124,6 +154,8 @@ class FHIRClient:
         # Construct the URL if endpoint is not a full URL
         if endpoint.startswith("http"):
             url = endpoint
+        elif not endpoint:
+            url = self.base_url
         else:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
@@ -133,10 +165,13 @@ class FHIRClient:
             request_headers.update(headers)
         
         try:
-            if params:
-                response = requests.get(url, params=params, headers=request_headers, timeout=REQUEST_TIMEOUT)
+            if json_body is not None:
+                request_headers["Content-Type"] = "application/fhir+json"
+                response = self.session.post(url, json=json_body, headers=request_headers, timeout=REQUEST_TIMEOUT)
+            elif params:
+                response = self.session.get(url, params=params, headers=request_headers, timeout=REQUEST_TIMEOUT)
             else:
-                response = requests.get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
+                response = self.session.get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
             
             # Check for rate limiting
             if response.status_code == 429:
@@ -151,7 +186,7 @@ class FHIRClient:
                 # Retry with new token
                 if retry_count < MAX_RETRIES:
                     logger.info(f"Retrying request with new token (attempt {retry_count+1}/{MAX_RETRIES})...")
-                    return self.make_request(endpoint, params, headers, retry_count + 1)
+                    return self.make_request(endpoint, params, headers, retry_count + 1, json_body)
                 else:
                     logger.error(f"Failed after {MAX_RETRIES} retry attempts")
                     response.raise_for_status()
@@ -173,7 +208,7 @@ class FHIRClient:
                     new_token = token_manager.get_token(force_refresh=True)
                     request_headers["Authorization"] = f"Bearer {new_token}"
                     logger.info(f"Retrying request with new token (attempt {retry_count+1}/{MAX_RETRIES})...")
-                    return self.make_request(endpoint, params, headers, retry_count + 1)
+                    return self.make_request(endpoint, params, headers, retry_count + 1, json_body)
                 else:
                     logger.error(f"Failed after {MAX_RETRIES} retry attempts")
                     response.raise_for_status()
@@ -197,7 +232,7 @@ class FHIRClient:
                 # Force token rotation for any HTTP error
                 new_token = token_manager.get_token(force_refresh=True)
                 request_headers["Authorization"] = f"Bearer {new_token}"
-                return self.make_request(endpoint, params, headers, retry_count + 1)
+                return self.make_request(endpoint, params, headers, retry_count + 1, json_body)
             else:
                 logger.error(f"Failed after {MAX_RETRIES} retry attempts: {e}")
                 raise
@@ -212,7 +247,7 @@ class FHIRClient:
                     pass  # Handle case where this method is not available
                 
                 time.sleep(2 ** retry_count)  # Exponential backoff
-                return self.make_request(endpoint, params, headers, retry_count + 1)
+                return self.make_request(endpoint, params, headers, retry_count + 1, json_body)
             else:
                 logger.error(f"Failed after {MAX_RETRIES} retry attempts: {e}")
                 raise
@@ -245,6 +280,37 @@ class FHIRClient:
         """
         return self.make_request(resource_type, params=params)
     
+    def batch_read(self, request_urls):
+        """
+        Perform several GET requests in a single round-trip using a FHIR batch Bundle.
+        
+        Args:
+            request_urls: Relative request URLs (e.g. "Patient/123" or "MedicationRequest?patient=Patient/123")
+            
+        Returns:
+            List of resources in the same order as request_urls, with None for entries that failed
+        """
+        if not request_urls:
+            return []
+        
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "batch",
+            "entry": [{"request": {"method": "GET", "url": url}} for url in request_urls]
+        }
+        
+        response = self.make_request("", json_body=bundle)
+        
+        # The batch-response entries correspond one-to-one with the request entries
+        results = []
+        for entry in (response or {}).get("entry", []):
+            status = entry.get("response", {}).get("status", "")
+            results.append(entry.get("resource") if status.startswith("2") else None)
+        
+        # Pad in case the server returned fewer entries than requested
+        results.extend([None] * (len(request_urls) - len(results)))
+        return results
+    
     def get_all_pages(self, resource_type, params=None):
         """
         Get all pages of a search result by following 'next' links.
@@ -4,8 +4,21 @@ Tracks and updates progress for long-running processes.
 """
 import os
 import json
+import functools
+import threading
+import time
 from datetime import datetime
 
+# Dashboards poll the progress files once per second per open tab; polls
+# within this many seconds of each other share one read of the progress files
+PROGRESS_CACHE_TTL = 0.2
+_progress_cache = (0.0, None)
+_progress_cache_lock = threading.Lock()
+
+# Parsed progress files keyed by filename, as (mtime_ns, size, data). Most
+# files are untouched between polls, so only changed ones are read and decoded
+_progress_file_cache = {}
+
 class ProgressTracker:
     """
     Tracks and updates progress for long-running processes.
@@ -112,6 +125,31 @@ class ProgressTracker:
         with open(current_filepath, 'w') as f:
             json.dump({"current_process": self.process_name, "updated_at": datetime.now().isoformat()}, f)
 
+def get_progress_snapshot():
+    """
+    Get the current process's progress and the progress of every tracked process.
+    
+    Both come from a single scan of the progress directory. Results are cached
+    for PROGRESS_CACHE_TTL seconds so concurrent dashboard polls collapse into
+    a single read.
+    
+    Returns:
+        Tuple of (current_progress, processes) where current_progress is the
+        dictionary for the current process (or None) and processes is a list of
+        progress dictionaries for all processes
+    """
+    global _progress_cache
+    
+    with _progress_cache_lock:
+        cached_at, snapshot = _progress_cache
+        now = time.monotonic()
+        if snapshot is not None and now - cached_at < PROGRESS_CACHE_TTL:
+            return snapshot
+        
+        snapshot = _read_progress_snapshot()
+        _progress_cache = (now, snapshot)
+        return snapshot
+
 def get_current_progress():
     """
     Get the progress of the currently running process.
@@ -119,17 +157,97 @@ def get_current_progress():
     Returns:
         Dictionary with progress information or None if no process is running
     """
+    return get_progress_snapshot()[0]
+
+def _read_progress_snapshot():
+    """
+    Read current.json and every process progress file in one pass over the progress directory.
+    
+    Returns:
+        Tuple of (current_progress, processes), as for get_progress_snapshot()
+    """
     progress_dir = os.path.join("output", ".progress")
-    current_filepath = os.path.join(progress_dir, 'current.json')
+    if not os.path.exists(progress_dir):
+        return None, []
     
-    if not os.path.exists(current_filepath):
-        return None
+    current_info = None
+    processes = {}
+    seen = set()
+    with os.scandir(progress_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            seen.add(entry.name)
+            data = _load_progress_file(entry)
+            if data is None:
+                continue
+            
+            if entry.name == 'current.json':
+                current_info = data
+            else:
+                processes[entry.name] = data
+    
+    # Forget files that have been removed since the last scan
+    for filename in _progress_file_cache.keys() - seen:
+        del _progress_file_cache[filename]
     
+    return _find_current_progress(current_info, processes), list(processes.values())
+
+def _load_progress_file(entry):
+    """
+    Load a progress file, reusing the parsed contents while it is unchanged.
+    
+    Args:
+        entry: os.DirEntry for the progress file
+        
+    Returns:
+        The parsed file contents, or None if the file could not be read
+    """
     try:
-        # Read current process info
-        with open(current_filepath, 'r') as f:
-            current_info = json.load(f)
+        stat = entry.stat()
+        cached = _progress_file_cache.get(entry.name)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        with open(entry.path, 'r') as f:
+            data = json.load(f)
+    except Exception:
+        _progress_file_cache.pop(entry.name, None)
+        return None
+    
+    _progress_file_cache[entry.name] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
+@functools.lru_cache(maxsize=256)
+def parse_timestamp(value):
+    """
+    Parse an ISO format timestamp from a progress file.
+    
+    Process start times never change, so repeated polls hit the cache.
+    
+    Args:
+        value: ISO format timestamp string
         
+    Returns:
+        The parsed datetime
+    """
+    return datetime.fromisoformat(value)
+
+def _find_current_progress(current_info, processes):
+    """
+    Look up the current process's progress.
+    
+    Args:
+        current_info: Contents of current.json, or None
+        processes: Dictionary mapping progress filenames to their contents
+        
+    Returns:
+        Dictionary with progress information or None if no process is running
+    """
+    if not current_info:
+        return None
+    
+    try:
         # Check if it was updated recently (within 5 minutes)
         updated_at = datetime.fromisoformat(current_info["updated_at"])
         if (datetime.now() - updated_at).total_seconds() > 300:
@@ -139,13 +257,7 @@ def get_current_progress():
         # Get detailed progress for the current process
         process_name = current_info["current_process"]
         filename = f"{process_name.replace(' ', '_').lower()}.json"
-        filepath = os.path.join(progress_dir, filename)
-        
-        if not os.path.exists(filepath):
-            return None
-        
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        return processes.get(filename)
             
     except Exception as e:
         print(f"Error getting progress: {e}")
@@ -24,7 +24,7 @@ def run_script_with_output(script_path):
     Returns:
         Tuple of (status, output) where status is "SUCCESS" or "ERROR"
     """
-    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting execution of {script_path}...")
+    print(f"[{datetime.now().isoformat(sep=' ', timespec='seconds')}] Starting execution of {script_path}...")
     
     # Capture stdout and stderr
     stdout_buffer = StringIO()
@@ -32,11 +32,11 @@ def run_script_with_output(script_path):
     
     try:
         # Import the module
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Importing module {script_path}...")
+        print(f"[{datetime.now().isoformat(sep=' ', timespec='seconds')}] Importing module {script_path}...")
         module = importlib.import_module(script_path)
         
         # Capture the script's output
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running main function from {script_path}...")
+        print(f"[{datetime.now().isoformat(sep=' ', timespec='seconds')}] Running main function from {script_path}...")
         with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
             # Run the main function
             if hasattr(module, 'main'):
@@ -48,11 +48,13 @@ def run_script_with_output(script_path):
         stdout_output = stdout_buffer.getvalue()
         stderr_output = stderr_buffer.getvalue()
         
-        # Add timestamps to each line of output for better visibility
+        # Add timestamps to each line of output for better visibility; the
+        # output is only processed once the script has finished, so every
+        # line gets the same timestamp
         timestamped_output = []
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
         for line in (stdout_output + stderr_output).splitlines():
             if line.strip():  # Skip empty lines
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 # Only add timestamp if line doesn't already have one (from logger)
                 if ' - INFO - ' in line or ' - ERROR - ' in line or ' - WARNING - ' in line:
                     timestamped_output.append(line)
@@ -62,7 +64,7 @@ def run_script_with_output(script_path):
         output = '\n'.join(timestamped_output)
         
         # Add final status message
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
         if result is True:
             output += f"\n[{timestamp}] Script execution completed successfully!"
             return "SUCCESS", output
@@ -72,7 +74,7 @@ def run_script_with_output(script_path):
     
     except Exception as e:
         # Capture any exceptions
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
         error_output = f"[{timestamp}] Exception: {str(e)}\n"
         error_output += traceback.format_exc()
         
@@ -87,12 +89,11 @@ def run_script_with_output(script_path):
         timestamped_output = []
         for line in (stdout_output + stderr_output).splitlines():
             if line.strip():  # Skip empty lines
-                line_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 # Only add timestamp if line doesn't already have one (from logger)
                 if ' - INFO - ' in line or ' - ERROR - ' in line or ' - WARNING - ' in line:
                     timestamped_output.append(line)
                 else:
-                    timestamped_output.append(f"[{line_timestamp}] {line}")
+                    timestamped_output.append(f"[{timestamp}] {line}")
         
         error_output += '\n'.join(timestamped_output)
         error_output += f"\n[{timestamp}] Script execution failed with an exception."
@@ -6,6 +6,8 @@ import requests
 import logging
 import io
 import csv
+import itertools
+import tempfile
 from datetime import datetime
 
 # Import configuration
@@ -24,6 +26,7 @@ class SharePointClient:
         self.token = None
         self.site_id = None
         self.drive_id = None
+        self.folder_verified = False
     
     def get_token(self):
         """Get Microsoft Graph API token"""
@@ -99,6 +102,10 @@ class SharePointClient:
     
     def ensure_folder_exists(self):
         """Ensure the target folder exists, create if not"""
+        # The folder only needs to be checked once per client
+        if self.folder_verified:
+            return True
+            
         site_id = self.get_site_id()
         drive_id = self.get_drive_id()
         headers = self.get_headers()
@@ -122,7 +129,8 @@ class SharePointClient:
             else:
                 folder_response.raise_for_status()
                 logger.info(f"Folder '{SP_FOLDER_PATH}' already exists")
-                
+            
+            self.folder_verified = True
             return True
             
         except Exception as e:
@@ -134,14 +142,14 @@ class SharePointClient:
         Upload data as CSV to SharePoint.
         
         Args:
-            data: List of dictionaries to upload as CSV
+            data: Iterable of dictionaries to upload as CSV (a list or a generator)
             filename: Target filename in SharePoint
             fieldnames: List of field names for CSV header
             
         Returns:
             True if successful, raises exception otherwise
         """
-        logger.info(f"Uploading {len(data)} records to SharePoint as '{filename}'")
+        logger.info(f"Uploading records to SharePoint as '{filename}'")
         
         # Ensure the folder exists
         self.ensure_folder_exists()
@@ -149,32 +157,41 @@ class SharePointClient:
         # Get IDs and headers
         site_id = self.get_site_id()
         drive_id = self.get_drive_id()
-        headers = self.get_headers()
-        
-        # Create CSV content in memory
-        csv_buffer = io.StringIO()
-        writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames, lineterminator='\n')
-        writer.writeheader()
-        writer.writerows(data)
         
         # Upload to SharePoint
         upload_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{SP_FOLDER_PATH}/{filename}:/content"
         upload_headers = self.get_headers()
         upload_headers["Content-Type"] = "text/csv"
         
-        try:
-            upload_response = requests.put(
-                upload_url, 
-                headers=upload_headers, 
-                data=csv_buffer.getvalue().encode('utf-8'),
-                timeout=REQUEST_TIMEOUT
-            )
-            upload_response.raise_for_status()
-            logger.info(f"Successfully uploaded {filename} to SharePoint")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to upload CSV to SharePoint: {e}")
-            raise
+        # Stream rows into a temp file so large exports don't hold a second
+        # full copy of the CSV in memory; requests streams the file body
+        with tempfile.TemporaryFile(mode="w+b") as csv_file:
+            text_stream = io.TextIOWrapper(csv_file, encoding="utf-8", newline="")
+            writer = csv.DictWriter(text_stream, fieldnames=fieldnames, lineterminator='\n')
+            writer.writeheader()
+            
+            row_count = 0
+            for row in data:
+                writer.writerow(row)
+                row_count += 1
+            
+            text_stream.flush()
+            text_stream.detach()
+            csv_file.seek(0)
+            
+            try:
+                upload_response = requests.put(
+                    upload_url, 
+                    headers=upload_headers, 
+                    data=csv_file,
+                    timeout=REQUEST_TIMEOUT
+                )
+                upload_response.raise_for_status()
+                logger.info(f"Successfully uploaded {row_count} records to SharePoint as {filename}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to upload CSV to SharePoint: {e}")
+                raise
     
     def download_csv(self, filename):
         """
@@ -239,9 +256,9 @@ class SharePointClient:
         for item in data:
             item['timestamp'] = timestamp
         
-        # Combine existing and new data
-        combined_data = existing_data + data
-        logger.info(f"Uploading {len(combined_data)} total records to '{filename}'")
+        # Combine existing and new data without copying either list
+        combined_data = itertools.chain(existing_data, data)
+        logger.info(f"Uploading {len(existing_data) + len(data)} total records to '{filename}'")
         
         # Upload the combined data
         return self.upload_csv(combined_data, filename, fieldnames)